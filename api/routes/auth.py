@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -10,7 +11,9 @@ from core.database import get_db, User
 from core.config import settings
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashing and verifying take tens of milliseconds of CPU, so routes run them in a
+# worker thread rather than on the event loop
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -74,7 +77,7 @@ async def register_user(username: str, email: str, password: str, db: Session =
             )
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await asyncio.to_thread(get_password_hash, password)
         user = User(
             username=username,
             email=email,
@@ -109,7 +112,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         # Find user by username
         user = db.query(User).filter(User.username == form_data.username).first()
         
-        if not user or not verify_password(form_data.password, user.hashed_password):
+        if not user or not await asyncio.to_thread(verify_password, form_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -167,14 +170,14 @@ async def change_password(
     """Change user password"""
     try:
         # Verify current password
-        if not verify_password(current_password, current_user.hashed_password):
+        if not await asyncio.to_thread(verify_password, current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Incorrect current password"
             )
         
         # Hash new password
-        new_hashed_password = get_password_hash(new_password)
+        new_hashed_password = await asyncio.to_thread(get_password_hash, new_password)
         
         # Update password
         current_user.hashed_password = new_hashed_password
@@ -223,7 +226,7 @@ async def create_admin_user(
             )
         
         # Create admin user
-        hashed_password = get_password_hash(password)
+        hashed_password = await asyncio.to_thread(get_password_hash, password)
         admin_user = User(
             username=username,
             email=email,
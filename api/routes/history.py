@@ -154,8 +154,8 @@ async def get_trading_summary(
         
         # Calculate basic statistics
         total_trades = len(trades)
-        total_volume = sum([t.total_value for t in trades])
-        total_fees = sum([t.fee for t in trades])
+        total_volume = sum(t.total_value for t in trades)
+        total_fees = sum(t.fee for t in trades)
         
         # Calculate win rate (simplified)
         buy_trades = [t for t in trades if t.side == "BUY"]
@@ -347,8 +347,8 @@ async def get_trading_analytics(
                 },
                 "strategy_performance": strategy_performance,
                 "total_trades": len(trades),
-                "total_volume": sum([t.total_value for t in trades]),
-                "total_fees": sum([t.fee for t in trades])
+                "total_volume": sum(t.total_value for t in trades),
+                "total_fees": sum(t.fee for t in trades)
             }
         }
         
@@ -438,8 +438,8 @@ async def get_bot_session_details(
             "total_trades": len(trades),
             "buy_trades": len([t for t in trades if t.side == "BUY"]),
             "sell_trades": len([t for t in trades if t.side == "SELL"]),
-            "total_volume": sum([t.total_value for t in trades]),
-            "total_fees": sum([t.fee for t in trades]),
+            "total_volume": sum(t.total_value for t in trades),
+            "total_fees": sum(t.fee for t in trades),
             "unique_symbols": len(set([t.symbol for t in trades])),
             "strategies_used": len(set([t.strategy.name for t in trades if t.strategy]))
         }
@@ -21,8 +21,8 @@ async def get_portfolio_overview(
         portfolios = db.query(Portfolio).filter(Portfolio.user_id == current_user.id).all()
         
         # Calculate totals
-        total_value = sum([p.total_value for p in portfolios])
-        total_pnl = sum([p.pnl for p in portfolios])
+        total_value = sum(p.total_value for p in portfolios)
+        total_pnl = sum(p.pnl for p in portfolios)
         total_pnl_percentage = (total_pnl / (total_value - total_pnl)) * 100 if (total_value - total_pnl) > 0 else 0
         
         # Get recent trades
@@ -287,8 +287,8 @@ async def get_risk_analysis(
             }
         
         # Calculate basic risk metrics
-        total_value = sum([p.total_value for p in portfolios])
-        total_pnl = sum([p.pnl for p in portfolios])
+        total_value = sum(p.total_value for p in portfolios)
+        total_pnl = sum(p.pnl for p in portfolios)
         
         # Calculate position concentration
         concentration_risk = []
@@ -378,7 +378,7 @@ async def rebalance_portfolio(
         
         # Get current portfolio
         portfolios = db.query(Portfolio).filter(Portfolio.user_id == current_user.id).all()
-        total_value = sum([p.total_value for p in portfolios])
+        total_value = sum(p.total_value for p in portfolios)
         
         if total_value == 0:
             raise HTTPException(
@@ -205,7 +205,7 @@ async def delete_strategy(
         # Check if strategy is active in trading engine
         if current_user.id in active_engines:
             engine = active_engines[current_user.id]
-            if str(strategy_id) in engine.active_strategies:
+            if strategy_id in engine.active_strategies:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Cannot delete active strategy. Stop the bot first."
@@ -450,14 +450,14 @@ async def get_trading_signals(
         engine = active_engines[current_user.id]
         signals = []
         
-        for strategy_id, strategy_info in engine.active_strategies.items():
-            if strategy_info.get("last_signal"):
-                signal = strategy_info["last_signal"]
+        for strategy_id, active in engine.active_strategies.items():
+            if active.last_signal:
+                signal = active.last_signal
                 signals.append({
                     "strategy_id": strategy_id,
-                    "strategy_name": strategy_info["strategy"].name,
-                    "symbol": strategy_info["symbol"],
-                    "signal_type": signal.signal_type.value,
+                    "strategy_name": active.strategy.name,
+                    "symbol": active.symbol,
+                    "signal_type": signal.signal_type.name,
                     "confidence": signal.confidence,
                     "price": signal.price,
                     "timestamp": signal.timestamp.isoformat(),
@@ -0,0 +1,88 @@
+"""
+Per-bar cost of evaluating many RSI strategies, one per symbol.
+
+Compares feeding each strategy its new bar through update_signal with
+recomputing RSI over every symbol's rolling bar buffer, as the grouped
+kernel path did: rebuild a closes matrix from the buffers each bar, then
+take the last RSI of every row.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rsi_updates
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.strategies import RSIStrategy
+from core.strategies_kernels import _rsi_last
+
+N_SYMBOLS = 50
+BUFFER_SIZE = 500  # TradingEngine.bar_buffer_size
+WARMUP_BARS = 1000
+TIMED_BARS = 2000
+BAR_MS = 3_600_000
+START_MS = 1_700_000_000_000
+
+def _make_bars(rng: np.random.Generator) -> list:
+    """OHLCV bars per symbol, as the engine buffers them"""
+    closes = 100 + np.cumsum(rng.normal(0, 1, (N_SYMBOLS, WARMUP_BARS + TIMED_BARS)), axis=1)
+    return [
+        [(START_MS + t * BAR_MS, 0.0, 0.0, 0.0, float(close), 0.0) for t, close in enumerate(row)]
+        for row in closes
+    ]
+
+def _warm_strategies(bars: list) -> list:
+    strategies = [RSIStrategy({}) for _ in range(N_SYMBOLS)]
+    for strategy, symbol_bars in zip(strategies, bars):
+        for bar in symbol_bars[:WARMUP_BARS]:
+            strategy.update_signal(bar)
+    return strategies
+
+def bench_update_signal(bars: list) -> float:
+    """Milliseconds per bar with update_signal"""
+    strategies = _warm_strategies(bars)
+    start = time.perf_counter()
+    for t in range(WARMUP_BARS, WARMUP_BARS + TIMED_BARS):
+        for strategy, symbol_bars in zip(strategies, bars):
+            strategy.update_signal(symbol_bars[t])
+    return (time.perf_counter() - start) / TIMED_BARS * 1e3
+
+def bench_window_recompute(bars: list) -> float:
+    """Milliseconds per bar recomputing RSI over the rolling buffers"""
+    strategies = _warm_strategies(bars)
+    buffers = [deque(symbol_bars[:WARMUP_BARS], maxlen=BUFFER_SIZE) for symbol_bars in bars]
+    rsi = np.empty(N_SYMBOLS, dtype=np.float64)
+    start = time.perf_counter()
+    for t in range(WARMUP_BARS, WARMUP_BARS + TIMED_BARS):
+        for buffer, symbol_bars in zip(buffers, bars):
+            buffer.append(symbol_bars[t])
+
+        closes = np.zeros((N_SYMBOLS, BUFFER_SIZE), dtype=np.float32)
+        for row, buffer in enumerate(buffers):
+            closes[row] = np.fromiter((bar[4] for bar in buffer), dtype=np.float32, count=BUFFER_SIZE)
+        for row in range(N_SYMBOLS):
+            rsi[row] = _rsi_last(closes[row], strategies[row].period)
+
+        for row, (strategy, buffer) in enumerate(zip(strategies, buffers)):
+            strategy._rsi_signal(rsi[row], buffer[-1][4], pd.Timestamp(buffer[-1][0], unit='ms'))
+    return (time.perf_counter() - start) / TIMED_BARS * 1e3
+
+def main():
+    bars = _make_bars(np.random.default_rng(0))
+
+    # Compile and fill caches before timing
+    bench_update_signal(bars)
+    bench_window_recompute(bars)
+
+    update_ms = bench_update_signal(bars)
+    window_ms = bench_window_recompute(bars)
+    print(f"{N_SYMBOLS} RSI strategies, {BUFFER_SIZE}-bar buffers, {TIMED_BARS} bars")
+    print(f"  window recompute: {window_ms:.3f} ms/bar")
+    print(f"  update_signal:    {update_ms:.3f} ms/bar ({window_ms / update_ms:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Numba JIT shim.
+
+Kernels are decorated with ``njit`` from here so that they run as plain
+Python functions when Numba is not installed. ``prange`` falls back to the
+builtin range, so parallel loops run serially.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
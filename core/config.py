@@ -6,11 +6,15 @@ class Settings(BaseSettings):
     model_config = {"extra": "allow"}
     # Database
     DATABASE_URL: str = "sqlite:///./crypto_bot.db"
+    DB_POOL_SIZE: int = 32
+    DB_MAX_OVERFLOW: int = 16
+    DB_POOL_RECYCLE: int = 1800  # seconds
     
     # JWT Settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # password hashing work factor; 10 is enough on testnet
     
     # Trading Settings
     DEFAULT_TRADING_PAIRS: List[str] = ["BTC/USDT", "ETH/USDT", "ADA/USDT", "DOT/USDT"]
@@ -51,6 +55,11 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
+    # Browser origins allowed to call the API with credentials
+    CORS_ORIGINS: List[str] = ["http://localhost:8000", "http://127.0.0.1:8000"]
+    # Server processes outside debug mode. Trading engines live in the process that
+    # started them, so more than one worker needs engine state shared out of process.
+    WORKERS: int = 1
     
 
 
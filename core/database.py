@@ -1,15 +1,26 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 from core.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Create database engine. Sessions are opened from worker threads, so server
+# databases get a pool large enough for concurrent DB work, with stale
+# connections checked and recycled; SQLite keeps its default pool.
+if "sqlite" in settings.DATABASE_URL:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -71,6 +82,9 @@ class Trade(Base):
     order_id = Column(String(100), nullable=True)
     status = Column(String(20), nullable=False, default="completed")
     
+    # Daily P&L and history queries filter by user and time range
+    __table_args__ = (Index("ix_trade_user_ts", "user_id", "timestamp"),)
+    
     # Relationships
     user = relationship("User", back_populates="trades")
     strategy = relationship("Strategy", back_populates="trades")
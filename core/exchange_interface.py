@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import logging
 import ccxt
 import ccxt.async_support as ccxt_async
+import ccxt.pro as ccxt_pro
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
@@ -19,6 +20,7 @@ class ExchangeInterface:
     def __init__(self, exchange_name: str = "binance"):
         self.exchange_name = exchange_name
         self.exchange = None
+        self.ws_exchange = None  # ccxt.pro instance for WebSocket streams
         self.client = None
         self.is_connected = False
         
@@ -46,13 +48,15 @@ class ExchangeInterface:
                     logger.info("Initialized Binance mainnet client")
                 
                 # Initialize CCXT for additional functionality
-                self.exchange = ccxt_async.binance({
+                exchange_config = {
                     'apiKey': api_key,
                     'secret': api_secret,
                     'sandbox': self.sandbox,
                     'testnet': self.testnet,
                     'enableRateLimit': True,
-                })
+                }
+                self.exchange = ccxt_async.binance(exchange_config)
+                self.ws_exchange = ccxt_pro.binance(exchange_config)
                 
             elif self.exchange_name == "coinbase":
                 # Initialize Coinbase Pro
@@ -60,13 +64,16 @@ class ExchangeInterface:
                 api_secret = settings.COINBASE_SECRET_KEY if hasattr(settings, 'COINBASE_SECRET_KEY') else ""
                 passphrase = settings.COINBASE_PASSPHRASE if hasattr(settings, 'COINBASE_PASSPHRASE') else ""
                 
-                self.exchange = ccxt_async.coinbasepro({
+                exchange_config = {
                     'apiKey': api_key,
                     'secret': api_secret,
                     'password': passphrase,
                     'sandbox': self.sandbox,
                     'enableRateLimit': True,
-                })
+                }
+                self.exchange = ccxt_async.coinbasepro(exchange_config)
+                if hasattr(ccxt_pro, 'coinbasepro'):
+                    self.ws_exchange = ccxt_pro.coinbasepro(exchange_config)
                 
             else:
                 # Generic CCXT exchange
@@ -80,6 +87,7 @@ class ExchangeInterface:
         except Exception as e:
             logger.error(f"Error initializing exchange: {e}")
             self.exchange = None
+            self.ws_exchange = None
             self.client = None
     
     async def connect(self) -> bool:
@@ -104,6 +112,8 @@ class ExchangeInterface:
         try:
             if self.exchange:
                 await self.exchange.close()
+                if self.ws_exchange:
+                    await self.ws_exchange.close()
                 self.is_connected = False
                 logger.info(f"Disconnected from {self.exchange_name}")
         except Exception as e:
@@ -190,6 +200,31 @@ class ExchangeInterface:
             logger.error(f"Error getting current price for {symbol}: {e}")
             return None
     
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for several symbols in one request"""
+        try:
+            if not self.is_connected:
+                logger.warning("Not connected to exchange")
+                return {}
+            
+            if not symbols:
+                return {}
+            
+            if self.exchange_name == "binance" and self.client:
+                # Use Binance client - without a symbol it returns every ticker
+                wanted = set(symbols)
+                tickers = self.client.get_symbol_ticker()
+                return {ticker['symbol']: float(ticker['price']) for ticker in tickers if ticker['symbol'] in wanted}
+                
+            else:
+                # Use CCXT
+                tickers = await self.exchange.fetch_tickers(symbols)
+                return {symbol: ticker['last'] for symbol, ticker in tickers.items() if ticker.get('last') is not None}
+                
+        except Exception as e:
+            logger.error(f"Error getting current prices: {e}")
+            return {}
+    
     async def get_market_data(self, symbol: str, timeframe: str = "1h", limit: int = 200) -> Optional[pd.DataFrame]:
         """Get historical market data (OHLCV)"""
         try:
@@ -226,6 +261,22 @@ class ExchangeInterface:
             logger.error(f"Error getting market data for {symbol}: {e}")
             return None
     
+    async def watch_ohlcv(self, symbol: str, timeframe: str = "1h") -> Optional[List[List]]:
+        """Wait for the next OHLCV update on the exchange WebSocket stream
+        
+        Returns the candles received so far (newest last, the newest still forming),
+        or None when streaming is unavailable so callers can fall back to polling.
+        """
+        try:
+            if not self.is_connected or not self.ws_exchange or not self.ws_exchange.has.get('watchOHLCV'):
+                return None
+            
+            return await self.ws_exchange.watch_ohlcv(symbol, self._convert_timeframe(timeframe))
+            
+        except Exception as e:
+            logger.error(f"Error watching market data for {symbol}: {e}")
+            return None
+    
     async def place_order(self, symbol: str, side: str, quantity: float, price: float, order_type: str = "LIMIT") -> Optional[Dict]:
         """Place an order on the exchange"""
         try:
@@ -1,10 +1,14 @@
+import asyncio
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+import math
+import sys
 from dataclasses import dataclass
 from enum import Enum
+from sqlalchemy import case, func
 
 from core.strategies import TradingSignal, SignalType
 from core.database import SessionLocal, Trade, Portfolio, RiskMetrics
@@ -12,12 +16,23 @@ from core.config import RISK_RULES
 
 logger = logging.getLogger(__name__)
 
+# Position sizes are quantised to 1e-6 units; multiplying by the inverse and
+# dividing back keeps the rounding exact for whole tick counts
+_INV_TICK = 1e6
+
 class RiskLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
-@dataclass
+# Overall risk score weights: position, market, correlation
+_RISK_WEIGHTS = (0.4, 0.3, 0.3)
+
+# Score thresholds separating LOW | MEDIUM | HIGH, for vectorised level lookup
+_LEVEL_THRESHOLDS = np.array([0.3, 0.6])
+_LEVELS_ARR = np.array([RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH], dtype=object)
+
+@dataclass(slots=True)
 class RiskAssessment:
     risk_score: float  # 0.0 to 1.0
     risk_level: RiskLevel
@@ -27,6 +42,26 @@ class RiskAssessment:
     risk_factors: List[str]
     recommendations: List[str]
 
+@dataclass(slots=True)
+class RiskContext:
+    """Snapshot of a user's portfolio with its aggregates computed once per fetch"""
+    portfolio: List[Portfolio]
+    portfolio_value: float = 0.0
+    total_pnl: float = 0.0
+
+def _pair_key(symbol_a: str, symbol_b: str) -> Tuple[str, str]:
+    """Order-independent correlation matrix key for a pair of symbols"""
+    return (symbol_a, symbol_b) if symbol_a < symbol_b else (symbol_b, symbol_a)
+
+def notional_to_quantity(notional: float, price: float) -> float:
+    """Base-asset quantity worth notional quote currency at price
+    
+    Rounded down to the position tick so the order never costs more than notional.
+    """
+    if price <= 0:
+        return 0.0
+    return math.floor(notional / price * _INV_TICK) / _INV_TICK
+
 class RiskManager:
     """Risk management system for enforcing trading limits and position sizing"""
     
@@ -42,41 +77,43 @@ class RiskManager:
     async def check_trade_allowed(self, user_id: int, signal: TradingSignal, symbol: str) -> bool:
         """Check if a trade is allowed based on risk rules"""
         try:
+            symbol = sys.intern(symbol)
+            
             # Get current portfolio state
-            portfolio = await self._get_user_portfolio(user_id)
-            current_risk = await self._calculate_portfolio_risk(user_id, portfolio)
+            ctx = await self._get_user_portfolio(user_id)
+            current_risk = await self._calculate_portfolio_risk(user_id, ctx)
             
             # Check basic risk limits
             if not self._check_basic_risk_limits(current_risk):
-                logger.warning(f"Trade blocked: Basic risk limits exceeded for user {user_id}")
+                logger.warning("Trade blocked: Basic risk limits exceeded for user %s", user_id)
                 return False
             
             # Check position concentration
-            if not self._check_position_concentration(portfolio, symbol, signal):
-                logger.warning(f"Trade blocked: Position concentration limit exceeded for {symbol}")
+            if not self._check_position_concentration(ctx, symbol, signal):
+                logger.warning("Trade blocked: Position concentration limit exceeded for %s", symbol)
                 return False
             
             # Check correlation limits
-            if not await self._check_correlation_limits(user_id, symbol, signal):
-                logger.warning(f"Trade blocked: Correlation limit exceeded for {symbol}")
+            if not await self._check_correlation_limits(user_id, ctx, symbol, signal):
+                logger.warning("Trade blocked: Correlation limit exceeded for %s", symbol)
                 return False
             
             # Check volatility limits
             if not await self._check_volatility_limits(symbol, signal):
-                logger.warning(f"Trade blocked: Volatility limit exceeded for {symbol}")
+                logger.warning("Trade blocked: Volatility limit exceeded for %s", symbol)
                 return False
             
             return True
             
         except Exception as e:
-            logger.error(f"Error checking trade allowance: {e}")
+            logger.error("Error checking trade allowance: %s", e)
             return False  # Block trade on error for safety
     
     async def adjust_position_size(self, user_id: int, symbol: str, base_size: float) -> float:
         """Adjust position size based on risk factors"""
         try:
             # Get risk assessment
-            risk_assessment = await self._assess_risk(user_id, symbol, base_size)
+            risk_assessment = await self.assess_risk(user_id, symbol, base_size)
             
             # Apply risk adjustments
             adjusted_size = base_size
@@ -96,25 +133,27 @@ class RiskManager:
             max_allowed = risk_assessment.max_position_size
             adjusted_size = min(adjusted_size, max_allowed)
             
-            # Round to reasonable precision
-            adjusted_size = round(adjusted_size, 6)
+            # Round half-up to reasonable precision
+            adjusted_size = math.floor(adjusted_size * _INV_TICK + 0.5) / _INV_TICK
             
-            logger.info(f"Position size adjusted: {base_size} -> {adjusted_size} for {symbol}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Position size adjusted: %s -> %s for %s", base_size, adjusted_size, symbol)
             return adjusted_size
             
         except Exception as e:
-            logger.error(f"Error adjusting position size: {e}")
+            logger.error("Error adjusting position size: %s", e)
             return base_size * 0.5  # Conservative fallback
     
     async def assess_risk(self, user_id: int, symbol: str, position_size: float) -> RiskAssessment:
         """Comprehensive risk assessment for a potential trade"""
         try:
+            symbol = sys.intern(symbol)
             risk_factors = []
             recommendations = []
             
             # Get portfolio data
-            portfolio = await self._get_user_portfolio(user_id)
-            portfolio_value = sum([p.total_value for p in portfolio])
+            ctx = await self._get_user_portfolio(user_id)
+            portfolio_value = ctx.portfolio_value
             
             # Calculate position concentration risk
             position_concentration = position_size / portfolio_value if portfolio_value > 0 else 0
@@ -129,7 +168,7 @@ class RiskManager:
                 recommendations.append("Consider waiting for lower volatility")
             
             # Calculate correlation risk
-            correlation_risk = await self._calculate_correlation_risk(user_id, symbol)
+            correlation_risk = await self._calculate_correlation_risk(user_id, symbol, ctx)
             if correlation_risk > self.correlation_limit:
                 risk_factors.append("High portfolio correlation")
                 recommendations.append("Diversify portfolio")
@@ -147,8 +186,12 @@ class RiskManager:
             else:
                 risk_level = RiskLevel.HIGH
             
-            # Calculate risk-adjusted position size
-            max_position_size = portfolio_value * self.max_position_size * (1 - risk_score)
+            # Calculate risk-adjusted position size; an empty portfolio has nothing
+            # to concentrate against, so the requested size stands
+            if portfolio_value > 0:
+                max_position_size = portfolio_value * self.max_position_size * (1 - risk_score)
+            else:
+                max_position_size = position_size
             
             # Calculate stop-loss and take-profit levels
             current_price = await self._get_current_price(symbol)
@@ -166,47 +209,126 @@ class RiskManager:
             )
             
         except Exception as e:
-            logger.error(f"Error assessing risk: {e}")
+            logger.error("Error assessing risk: %s", e)
             # Return conservative assessment on error
-            return RiskAssessment(
-                risk_score=0.8,
-                risk_level=RiskLevel.HIGH,
-                max_position_size=0,
-                stop_loss_price=0,
-                take_profit_price=0,
-                risk_factors=["Error in risk assessment"],
-                recommendations=["Contact support"]
-            )
+            return self._conservative_assessment()
     
-    def _check_basic_risk_limits(self, current_risk: Dict) -> bool:
-        """Check basic risk limits"""
+    async def assess_risk_batch(self, user_id: int, symbols: List[str], sizes: np.ndarray) -> List[RiskAssessment]:
+        """Risk assessment for many symbols against a single portfolio snapshot"""
         try:
-            # Check daily loss limit
-            if current_risk.get("daily_pnl", 0) < -(current_risk.get("portfolio_value", 0) * self.max_daily_loss):
-                return False
+            symbols = [sys.intern(symbol) for symbol in symbols]
+            sizes = np.asarray(sizes, dtype=np.float64)
             
-            # Check drawdown limit
-            if current_risk.get("drawdown", 0) > self.max_drawdown:
-                return False
+            # Fetch portfolio and correlations once for the whole batch
+            ctx = await self._get_user_portfolio(user_id)
+            portfolio_value = ctx.portfolio_value
+            correlation_matrix = await self._calculate_correlation_matrix(user_id)
             
-            # Check portfolio risk
-            if current_risk.get("portfolio_risk", 0) > self.max_portfolio_risk:
-                return False
+            market_risks, correlation_risks, prices = await asyncio.gather(
+                asyncio.gather(*(self._calculate_market_risk(symbol) for symbol in symbols)),
+                asyncio.gather(*(
+                    self._calculate_correlation_risk(user_id, symbol, ctx, correlation_matrix)
+                    for symbol in symbols
+                )),
+                asyncio.gather(*(self._get_current_price(symbol) for symbol in symbols))
+            )
+            market_risks = np.asarray(market_risks, dtype=np.float64)
+            correlation_risks = np.asarray(correlation_risks, dtype=np.float64)
+            prices = np.asarray(prices, dtype=np.float64)
             
-            return True
+            # Score and classify all symbols at once
+            if portfolio_value > 0:
+                concentrations = sizes / portfolio_value
+            else:
+                concentrations = np.zeros_like(sizes)
+            scores = np.clip(
+                _RISK_WEIGHTS[0] * concentrations +
+                _RISK_WEIGHTS[1] * market_risks +
+                _RISK_WEIGHTS[2] * correlation_risks,
+                0.0, 1.0
+            )
+            level_idx = np.searchsorted(_LEVEL_THRESHOLDS, scores, side="right")
+            levels = _LEVELS_ARR[level_idx]
+            
+            if portfolio_value > 0:
+                max_position_sizes = portfolio_value * self.max_position_size * (1 - scores)
+            else:
+                max_position_sizes = sizes
+            stop_loss_pcts = np.array([self._get_stop_loss_percentage(level) for level in _LEVELS_ARR])
+            take_profit_pcts = np.array([self._get_take_profit_percentage(level) for level in _LEVELS_ARR])
+            stop_loss_prices, take_profit_prices = self._calculate_exit_prices(
+                prices, stop_loss_pcts[level_idx], take_profit_pcts[level_idx]
+            )
+            
+            high_concentration = concentrations > self.max_position_size
+            high_market_risk = market_risks > 0.7
+            high_correlation = correlation_risks > self.correlation_limit
+            
+            assessments = []
+            for i in range(len(symbols)):
+                risk_factors = []
+                recommendations = []
+                if high_concentration[i]:
+                    risk_factors.append("High position concentration")
+                    recommendations.append("Reduce position size")
+                if high_market_risk[i]:
+                    risk_factors.append("High market volatility")
+                    recommendations.append("Consider waiting for lower volatility")
+                if high_correlation[i]:
+                    risk_factors.append("High portfolio correlation")
+                    recommendations.append("Diversify portfolio")
+                
+                assessments.append(RiskAssessment(
+                    risk_score=float(scores[i]),
+                    risk_level=levels[i],
+                    max_position_size=float(max_position_sizes[i]),
+                    stop_loss_price=float(stop_loss_prices[i]),
+                    take_profit_price=float(take_profit_prices[i]),
+                    risk_factors=risk_factors,
+                    recommendations=recommendations
+                ))
+            
+            return assessments
             
         except Exception as e:
-            logger.error(f"Error checking basic risk limits: {e}")
+            logger.error("Error assessing risk batch: %s", e)
+            return [self._conservative_assessment() for _ in symbols]
+    
+    def _conservative_assessment(self) -> RiskAssessment:
+        """Assessment used when the real one cannot be computed"""
+        return RiskAssessment(
+            risk_score=0.8,
+            risk_level=RiskLevel.HIGH,
+            max_position_size=0,
+            stop_loss_price=0,
+            take_profit_price=0,
+            risk_factors=["Error in risk assessment"],
+            recommendations=["Contact support"]
+        )
+    
+    def _check_basic_risk_limits(self, current_risk: Dict) -> bool:
+        """Check basic risk limits"""
+        # Check daily loss limit
+        if current_risk.get("daily_pnl", 0) < -(current_risk.get("portfolio_value", 0) * self.max_daily_loss):
+            return False
+        
+        # Check drawdown limit
+        if current_risk.get("drawdown", 0) > self.max_drawdown:
+            return False
+        
+        # Check portfolio risk
+        if current_risk.get("portfolio_risk", 0) > self.max_portfolio_risk:
             return False
+        
+        return True
     
-    def _check_position_concentration(self, portfolio: List[Portfolio], symbol: str, signal: TradingSignal) -> bool:
+    def _check_position_concentration(self, ctx: RiskContext, symbol: str, signal: TradingSignal) -> bool:
         """Check position concentration limits"""
         try:
-            # Calculate total portfolio value
-            total_value = sum([p.total_value for p in portfolio])
+            total_value = ctx.portfolio_value
             
             # Calculate current position value for this symbol
-            current_position = next((p for p in portfolio if p.symbol == symbol), None)
+            current_position = next((p for p in ctx.portfolio if p.symbol == symbol), None)
             current_value = current_position.total_value if current_position else 0
             
             # Calculate new position value
@@ -220,14 +342,13 @@ class RiskManager:
             return concentration <= self.max_position_size
             
         except Exception as e:
-            logger.error(f"Error checking position concentration: {e}")
+            logger.error("Error checking position concentration: %s", e)
             return False
     
-    async def _check_correlation_limits(self, user_id: int, symbol: str, signal: TradingSignal) -> bool:
+    async def _check_correlation_limits(self, user_id: int, ctx: RiskContext, symbol: str, signal: TradingSignal) -> bool:
         """Check correlation limits with existing positions"""
         try:
-            # Get existing positions
-            portfolio = await self._get_user_portfolio(user_id)
+            portfolio = ctx.portfolio
             if len(portfolio) < 2:
                 return True  # No correlation risk with single position
             
@@ -237,14 +358,14 @@ class RiskManager:
             # Check if new position would exceed correlation limits
             for position in portfolio:
                 if position.symbol != symbol:
-                    correlation = correlation_matrix.get(f"{symbol}_{position.symbol}", 0)
+                    correlation = correlation_matrix.get(_pair_key(symbol, position.symbol), 0)
                     if correlation > self.correlation_limit:
                         return False
             
             return True
             
         except Exception as e:
-            logger.error(f"Error checking correlation limits: {e}")
+            logger.error("Error checking correlation limits: %s", e)
             return True  # Allow trade on error
     
     async def _check_volatility_limits(self, symbol: str, signal: TradingSignal) -> bool:
@@ -257,21 +378,18 @@ class RiskManager:
             max_volatility = 0.5  # 50% annualized volatility
             
             if volatility > max_volatility:
-                logger.warning(f"High volatility detected for {symbol}: {volatility:.2%}")
+                logger.warning("High volatility detected for %s: %.2f%%", symbol, volatility * 100)
                 return False
             
             return True
             
         except Exception as e:
-            logger.error(f"Error checking volatility limits: {e}")
+            logger.error("Error checking volatility limits: %s", e)
             return True  # Allow trade on error
     
-    async def _calculate_portfolio_risk(self, user_id: int, portfolio: List[Portfolio]) -> Dict:
+    async def _calculate_portfolio_risk(self, user_id: int, ctx: RiskContext) -> Dict:
         """Calculate overall portfolio risk metrics"""
         try:
-            total_value = sum([p.total_value for p in portfolio])
-            total_pnl = sum([p.pnl for p in portfolio])
-            
             # Calculate daily P&L
             daily_pnl = await self._calculate_daily_pnl(user_id)
             
@@ -279,18 +397,18 @@ class RiskManager:
             drawdown = await self._calculate_drawdown(user_id)
             
             # Calculate portfolio risk (VaR-like measure)
-            portfolio_risk = await self._calculate_value_at_risk(user_id, portfolio)
+            portfolio_risk = await self._calculate_value_at_risk(user_id, ctx)
             
             return {
-                "portfolio_value": total_value,
-                "total_pnl": total_pnl,
+                "portfolio_value": ctx.portfolio_value,
+                "total_pnl": ctx.total_pnl,
                 "daily_pnl": daily_pnl,
                 "drawdown": drawdown,
                 "portfolio_risk": portfolio_risk
             }
             
         except Exception as e:
-            logger.error(f"Error calculating portfolio risk: {e}")
+            logger.error("Error calculating portfolio risk: %s", e)
             return {
                 "portfolio_value": 0,
                 "total_pnl": 0,
@@ -299,15 +417,15 @@ class RiskManager:
                 "portfolio_risk": 0
             }
     
-    async def _calculate_correlation_matrix(self, user_id: int) -> Dict[str, float]:
-        """Calculate correlation matrix for user's positions"""
+    async def _calculate_correlation_matrix(self, user_id: int) -> Dict[Tuple[str, str], float]:
+        """Calculate correlation matrix for user's positions, keyed by _pair_key"""
         try:
             # This would typically use historical price data
             # For now, return a simple correlation matrix
             return {}
             
         except Exception as e:
-            logger.error(f"Error calculating correlation matrix: {e}")
+            logger.error("Error calculating correlation matrix: %s", e)
             return {}
     
     async def _calculate_volatility(self, symbol: str) -> float:
@@ -318,16 +436,44 @@ class RiskManager:
             return 0.3  # 30% annualized volatility
             
         except Exception as e:
-            logger.error(f"Error calculating volatility: {e}")
+            logger.error("Error calculating volatility: %s", e)
             return 0.3
     
-    async def _calculate_value_at_risk(self, user_id: int, portfolio: List[Portfolio], confidence: float = 0.95) -> float:
+    async def _calculate_market_risk(self, symbol: str) -> float:
+        """Calculate market risk (0.0 to 1.0) for a symbol from its volatility"""
+        try:
+            volatility = await self._calculate_volatility(symbol)
+            
+            # Normalise against the 50% annualized volatility limit
+            return min(1.0, volatility / 0.5)
+            
+        except Exception as e:
+            logger.error("Error calculating market risk: %s", e)
+            return 0.5
+    
+    async def _calculate_correlation_risk(self, user_id: int, symbol: str, ctx: RiskContext,
+                                          correlation_matrix: Optional[Dict[Tuple[str, str], float]] = None) -> float:
+        """Calculate the highest correlation between a symbol and the user's other positions"""
+        try:
+            if correlation_matrix is None:
+                correlation_matrix = await self._calculate_correlation_matrix(user_id)
+            
+            return max(
+                (correlation_matrix.get(_pair_key(symbol, p.symbol), 0) for p in ctx.portfolio if p.symbol != symbol),
+                default=0.0
+            )
+            
+        except Exception as e:
+            logger.error("Error calculating correlation risk: %s", e)
+            return 0.0
+    
+    async def _calculate_value_at_risk(self, user_id: int, ctx: RiskContext, confidence: float = 0.95) -> float:
         """Calculate Value at Risk for the portfolio"""
         try:
             # This is a simplified VaR calculation
             # In production, you'd use historical simulation or Monte Carlo methods
             
-            total_value = sum([p.total_value for p in portfolio])
+            total_value = ctx.portfolio_value
             if total_value == 0:
                 return 0
             
@@ -339,26 +485,19 @@ class RiskManager:
             return var
             
         except Exception as e:
-            logger.error(f"Error calculating VaR: {e}")
+            logger.error("Error calculating VaR: %s", e)
             return 0
     
     def _calculate_overall_risk_score(self, position_concentration: float, market_risk: float, correlation_risk: float) -> float:
         """Calculate overall risk score from individual risk factors"""
-        try:
-            # Weighted average of risk factors
-            weights = [0.4, 0.3, 0.3]  # Position, market, correlation
-            
-            risk_score = (
-                weights[0] * position_concentration +
-                weights[1] * market_risk +
-                weights[2] * correlation_risk
-            )
-            
-            return min(1.0, max(0.0, risk_score))
-            
-        except Exception as e:
-            logger.error(f"Error calculating overall risk score: {e}")
-            return 0.5  # Medium risk on error
+        # Weighted average of risk factors
+        risk_score = (
+            _RISK_WEIGHTS[0] * position_concentration +
+            _RISK_WEIGHTS[1] * market_risk +
+            _RISK_WEIGHTS[2] * correlation_risk
+        )
+        
+        return min(1.0, max(0.0, risk_score))
     
     def _get_stop_loss_percentage(self, risk_level: RiskLevel) -> float:
         """Get stop-loss percentage based on risk level"""
@@ -378,42 +517,57 @@ class RiskManager:
         }
         return take_profit_percentages.get(risk_level, 0.08)
     
+    @staticmethod
+    def _calculate_exit_prices(current_prices: np.ndarray, stop_loss_pcts: np.ndarray,
+                               take_profit_pcts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate stop-loss and take-profit prices for a batch of symbols in one vector op"""
+        pct = np.stack([-stop_loss_pcts, take_profit_pcts], axis=1)
+        prices = current_prices[:, None] * (1 + pct)
+        return prices[:, 0], prices[:, 1]
+    
     def _estimate_position_size(self, signal: TradingSignal) -> float:
         """Estimate position size for risk calculations"""
         # This is a simplified estimation
         # In practice, you'd use the actual calculated position size
         return 0.01  # 1% of portfolio as default
     
-    async def _get_user_portfolio(self, user_id: int) -> List[Portfolio]:
-        """Get user's current portfolio"""
+    async def _get_user_portfolio(self, user_id: int) -> RiskContext:
+        """Get user's current portfolio along with its aggregate value and P&L"""
         try:
             db = SessionLocal()
             portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).all()
             db.close()
-            return portfolio
+            
+            # Intern symbols so the per-position comparisons are identity checks
+            for p in portfolio:
+                p.symbol = sys.intern(p.symbol)
+            
+            # Aggregate once here so downstream checks don't re-scan the positions
+            n = len(portfolio)
+            ctx = RiskContext(portfolio)
+            ctx.portfolio_value = float(np.fromiter((p.total_value for p in portfolio), dtype=np.float64, count=n).sum())
+            ctx.total_pnl = float(np.fromiter((p.pnl for p in portfolio), dtype=np.float64, count=n).sum())
+            return ctx
         except Exception as e:
-            logger.error(f"Error getting user portfolio: {e}")
-            return []
+            logger.error("Error getting user portfolio: %s", e)
+            return RiskContext([])
     
     async def _calculate_daily_pnl(self, user_id: int) -> float:
         """Calculate daily P&L for user"""
         try:
             db = SessionLocal()
             today = datetime.now().date()
-            trades = db.query(Trade).filter(
+            daily_pnl = db.query(
+                func.coalesce(func.sum(case((Trade.side == "SELL", Trade.total_value), else_=-Trade.total_value)), 0.0)
+            ).filter(
                 Trade.user_id == user_id,
                 Trade.timestamp >= today
-            ).all()
-            
-            daily_pnl = sum([
-                (trade.total_value if trade.side == "SELL" else -trade.total_value)
-                for trade in trades
-            ])
+            ).scalar()
             
             db.close()
-            return daily_pnl
+            return float(daily_pnl)
         except Exception as e:
-            logger.error(f"Error calculating daily P&L: {e}")
+            logger.error("Error calculating daily P&L: %s", e)
             return 0
     
     async def _calculate_drawdown(self, user_id: int) -> float:
@@ -424,7 +578,7 @@ class RiskManager:
             return 0.05  # 5% drawdown
             
         except Exception as e:
-            logger.error(f"Error calculating drawdown: {e}")
+            logger.error("Error calculating drawdown: %s", e)
             return 0
     
     async def _get_current_price(self, symbol: str) -> float:
@@ -435,7 +589,7 @@ class RiskManager:
             return 100.0  # Default price
             
         except Exception as e:
-            logger.error(f"Error getting current price: {e}")
+            logger.error("Error getting current price: %s", e)
             return 100.0
     
     async def _calculate_volatility_factor(self, symbol: str) -> float:
@@ -452,5 +606,5 @@ class RiskManager:
                 return 1.0
                 
         except Exception as e:
-            logger.error(f"Error calculating volatility factor: {e}")
+            logger.error("Error calculating volatility factor: %s", e)
             return 0.75  # Conservative default
@@ -1,13 +1,36 @@
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, List, Tuple, Optional, Sequence
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+import functools
 import logging
 
+from core.strategies_kernels import (
+    _rsi_last, _macd_last2, _bb_last,
+    _rsi_signals, _rsi_signals_multi, _rsi_signals_sweep, _macd_signals, _bb_signals, _ma_crossover_signals,
+    _BUY, _SELL
+)
+
 logger = logging.getLogger(__name__)
 
+def _ensure_close_array(data: pd.DataFrame) -> np.ndarray:
+    """Close prices as the C-contiguous array the indicator kernels expect
+    
+    float32 close columns stay float32; anything else is converted to float64.
+    The array is cached on the DataFrame so every strategy evaluated on the same
+    frame shares one conversion. Frames are not expected to change once handed to
+    a strategy; the cache is only rebuilt when the length differs.
+    """
+    close = data.__dict__.get('_close_np_cache')
+    if close is None or len(close) != len(data):
+        dtype = np.float32 if data['close'].dtype == np.float32 else np.float64
+        close = np.ascontiguousarray(data['close'].to_numpy(dtype=dtype))
+        # object.__setattr__ skips pandas' column-attribute handling and warning
+        object.__setattr__(data, '_close_np_cache', close)
+    return close
+
 # Trading Strategy Configurations
 TRADING_STRATEGIES = {
     "rsi": {
@@ -59,12 +82,13 @@ TRADING_STRATEGIES = {
     }
 }
 
-class SignalType(Enum):
-    BUY = "BUY"
-    SELL = "SELL"
-    HOLD = "HOLD"
+class SignalType(IntEnum):
+    # Same codes as the batch kernels write into SignalArray.signal_type
+    BUY = 1
+    SELL = -1
+    HOLD = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingSignal:
     signal_type: SignalType
     confidence: float  # 0.0 to 1.0
@@ -72,15 +96,54 @@ class TradingSignal:
     timestamp: pd.Timestamp
     strategy_name: str
     parameters: Dict
-    additional_info: Dict = None
+    additional_info: Optional[Dict] = field(default=None)
+
+# Timestamp of HOLD signals returned when there is not enough data to evaluate
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+@dataclass(slots=True)
+class SignalArray:
+    """Per-bar signals from batch evaluation, one parallel array per field"""
+    signal_type: np.ndarray  # int8 SignalType codes
+    confidence: np.ndarray  # float32
+    price: np.ndarray  # float64
+    timestamp: np.ndarray  # bar index values, datetime64 for a DatetimeIndex
+    
+    def __len__(self) -> int:
+        return len(self.signal_type)
+
+@functools.lru_cache(maxsize=256)
+def _ms_timestamp(ms: int) -> pd.Timestamp:
+    """Timestamp for milliseconds since the epoch
+    
+    Bars of every symbol close at the same times, so the strategies fed a bar
+    share one Timestamp instead of each building its own.
+    """
+    return pd.Timestamp(ms, unit='ms')
+
+def _bar_time(bar: Sequence[float]) -> pd.Timestamp:
+    """Timestamp of an OHLCV bar whose first field is milliseconds since the epoch"""
+    return _ms_timestamp(bar[0])
+
+def _signal_array(data: pd.DataFrame, signal_type: np.ndarray, confidence: np.ndarray) -> SignalArray:
+    """Wrap per-bar signal buffers with the prices and timestamps of data
+    
+    Prices are float64 whatever the close dtype, so float32 frames give the same
+    result layout.
+    """
+    return SignalArray(signal_type, confidence, _ensure_close_array(data).astype(np.float64, copy=False),
+                       data.index.to_numpy(copy=True))
 
 class BaseStrategy:
     """Base class for all trading strategies"""
     
+    __slots__ = ('name', 'parameters', 'min_data_points', '_last_hold', '_bars_seen')
+    
     def __init__(self, name: str, parameters: Dict):
         self.name = name
         self.parameters = parameters
         self.min_data_points = 100
+        self._last_hold: Optional[TradingSignal] = None
         
     def validate_data(self, data: pd.DataFrame) -> bool:
         """Validate that we have enough data for the strategy"""
@@ -93,6 +156,73 @@ class BaseStrategy:
         """Calculate trading signal - to be implemented by subclasses"""
         raise NotImplementedError
     
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        """Feed the next closed bar and return the signal as of that bar
+        
+        bar is an OHLCV row (timestamp in ms, open, high, low, close, volume) as
+        ccxt returns it. Strategies keep running indicator state or a window
+        of recent closes, so a bar costs a fixed amount of work rather than a
+        recalculation over the whole history. Bars must be fed oldest first, each
+        exactly once; reset_state starts over.
+        """
+        raise NotImplementedError
+    
+    def reset_state(self):
+        """Forget all bars fed through update_signal"""
+        self._bars_seen = 0
+    
+    def cleanup(self):
+        """Drop the cached HOLD signal and incremental state"""
+        self._last_hold = None
+        self.reset_state()
+    
+    def _hold(self, price: float, timestamp: pd.Timestamp) -> TradingSignal:
+        """HOLD signal, reusing the previous one when price and timestamp are unchanged"""
+        hold = self._last_hold
+        if hold is None or hold.price != price or hold.timestamp != timestamp:
+            hold = TradingSignal(SignalType.HOLD, 0.0, price, timestamp, self.name, self.parameters)
+            self._last_hold = hold
+        return hold
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        """Evaluate the strategy at every bar of data, e.g. for backtesting
+        
+        Entry i of the result holds the signal calculate_signal would return
+        for data.iloc[:i + 1]. This default replays calculate_signal bar by
+        bar; subclasses override it with a single pass over the closes.
+        """
+        signals = np.zeros(len(data), dtype=np.int8)
+        confidence = np.zeros(len(data), dtype=np.float32)
+        for i in range(self.min_data_points - 1, len(data)):
+            signal = self.calculate_signal(data.iloc[:i + 1])
+            signals[i] = signal.signal_type
+            confidence[i] = signal.confidence
+        return _signal_array(data, signals, confidence)
+    
+    def calculate_signals_multi_symbol(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, SignalArray]:
+        """calculate_signals_batch for several symbols at once
+        
+        This default evaluates the symbols one after another; strategies with a
+        parallel kernel override it to fan the symbols out across cores.
+        """
+        return {symbol: self.calculate_signals_batch(data) for symbol, data in data_by_symbol.items()}
+    
+    @classmethod
+    def calculate_signals_sweep(cls, data: pd.DataFrame, parameter_sets: List[Dict]) -> List[SignalArray]:
+        """calculate_signals_batch for each parameter set, e.g. for parameter optimisation
+        
+        This default evaluates the parameter sets one after another; strategies
+        with a parallel kernel override it to spread them across cores.
+        """
+        return [cls(parameters).calculate_signals_batch(data) for parameters in parameter_sets]
+    
+    def _run_signal_kernel(self, kernel, data: pd.DataFrame, *args) -> SignalArray:
+        """Run a *_signals kernel over the closes of data into fresh signal buffers"""
+        signals = np.empty(len(data), dtype=np.int8)
+        confidence = np.empty(len(data), dtype=np.float32)
+        kernel(_ensure_close_array(data), *args, self.min_data_points, signals, confidence)
+        return _signal_array(data, signals, confidence)
+    
     def get_position_size(self, portfolio_value: float, risk_per_trade: float) -> float:
         """Calculate position size based on risk management rules"""
         return portfolio_value * risk_per_trade
@@ -100,24 +230,60 @@ class BaseStrategy:
 class RSIStrategy(BaseStrategy):
     """RSI (Relative Strength Index) Trading Strategy"""
     
+    __slots__ = ('period', 'oversold', 'overbought', '_compute', '_prev_close', '_avg_gain', '_avg_loss')
+    
     def __init__(self, parameters: Dict):
         super().__init__("RSI Strategy", parameters)
-        self.period = parameters.get("period", 14)
-        self.oversold = parameters.get("oversold", 30)
-        self.overbought = parameters.get("overbought", 70)
+        self.period = int(parameters.get("period", 14))
+        self.oversold = float(parameters.get("oversold", 30))
+        self.overbought = float(parameters.get("overbought", 70))
         self.min_data_points = self.period + 10
+        self._compute = functools.partial(_rsi_last, period=self.period)
+        self.reset_state()
         
     def calculate_signal(self, data: pd.DataFrame) -> TradingSignal:
         if not self.validate_data(data):
-            return TradingSignal(SignalType.HOLD, 0.0, 0.0, pd.Timestamp.now(), self.name, self.parameters)
+            return self._hold(0.0, _EPOCH)
         
         # Calculate RSI
-        rsi = ta.momentum.RSIIndicator(data['close'], window=self.period).rsi()
-        current_rsi = rsi.iloc[-1]
-        current_price = data['close'].iloc[-1]
-        current_time = data.index[-1]
+        close = _ensure_close_array(data)
+        current_rsi = self._compute(close)
+        return self._rsi_signal(current_rsi, close[-1], data.index[-1])
+    
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        current_price = bar[4]
         
-        # Generate signals
+        # Wilder smoothing of gains and losses, as in _rsi_last
+        if self._bars_seen:
+            change = current_price - self._prev_close
+            alpha = 1.0 / self.period
+            if change > 0:
+                self._avg_gain += alpha * (change - self._avg_gain)
+                self._avg_loss -= alpha * self._avg_loss
+            else:
+                self._avg_gain -= alpha * self._avg_gain
+                self._avg_loss += alpha * (-change - self._avg_loss)
+        self._prev_close = current_price
+        self._bars_seen += 1
+        
+        current_time = _bar_time(bar)
+        if self._bars_seen < self.min_data_points:
+            return self._hold(current_price, current_time)
+        
+        if self._avg_loss == 0.0:
+            current_rsi = 100.0
+        else:
+            current_rsi = 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+        return self._rsi_signal(current_rsi, current_price, current_time)
+    
+    def reset_state(self):
+        super().reset_state()
+        self._prev_close = 0.0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+    
+    def _rsi_signal(self, current_rsi: float, current_price: float, current_time: pd.Timestamp) -> TradingSignal:
+        """Signal for an RSI reading"""
         if current_rsi < self.oversold:
             # Oversold condition - potential buy signal
             confidence = min(1.0, (self.oversold - current_rsi) / self.oversold)
@@ -143,50 +309,125 @@ class RSIStrategy(BaseStrategy):
                 {"rsi_value": current_rsi, "overbought_threshold": self.overbought}
             )
         else:
-            return TradingSignal(SignalType.HOLD, 0.0, current_price, current_time, self.name, self.parameters)
+            return self._hold(current_price, current_time)
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        return self._run_signal_kernel(
+            _rsi_signals, data, self.period, self.oversold, self.overbought
+        )
+    
+    @classmethod
+    def calculate_signals_sweep(cls, data: pd.DataFrame, parameter_sets: List[Dict]) -> List[SignalArray]:
+        strategies = [cls(parameters) for parameters in parameter_sets]
+        n = len(data)
+        signals = np.empty((len(strategies), n), dtype=np.int8)
+        confidence = np.empty((len(strategies), n), dtype=np.float32)
+        _rsi_signals_sweep(
+            _ensure_close_array(data),
+            np.array([strategy.period for strategy in strategies], dtype=np.int64),
+            np.array([strategy.oversold for strategy in strategies], dtype=np.float64),
+            np.array([strategy.overbought for strategy in strategies], dtype=np.float64),
+            np.array([strategy.min_data_points for strategy in strategies], dtype=np.int64),
+            signals, confidence
+        )
+        return [_signal_array(data, signals[i], confidence[i]) for i in range(len(strategies))]
+    
+    def calculate_signals_multi_symbol(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, SignalArray]:
+        # Concatenate all closes so a single parallel kernel call covers every symbol
+        frames = list(data_by_symbol.values())
+        lengths = np.fromiter((len(data) for data in frames), dtype=np.int64, count=len(frames))
+        offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        closes = np.concatenate([_ensure_close_array(data) for data in frames]) if frames else np.empty(0)
+        
+        signals = np.empty(len(closes), dtype=np.int8)
+        confidence = np.empty(len(closes), dtype=np.float32)
+        _rsi_signals_multi(
+            closes, offsets, self.period, self.oversold, self.overbought,
+            self.min_data_points, signals, confidence
+        )
+        return {
+            symbol: _signal_array(data, signals[offsets[i]:offsets[i + 1]], confidence[offsets[i]:offsets[i + 1]])
+            for i, (symbol, data) in enumerate(data_by_symbol.items())
+        }
 
 class MACDStrategy(BaseStrategy):
     """MACD (Moving Average Convergence Divergence) Trading Strategy"""
     
+    __slots__ = (
+        'fast_period', 'slow_period', 'signal_period', '_compute',
+        '_ema_fast', '_ema_slow', '_signal_ema', '_prev_macd', '_prev_signal'
+    )
+    
     def __init__(self, parameters: Dict):
         super().__init__("MACD Strategy", parameters)
-        self.fast_period = parameters.get("fast_period", 12)
-        self.slow_period = parameters.get("slow_period", 26)
-        self.signal_period = parameters.get("signal_period", 9)
+        self.fast_period = int(parameters.get("fast_period", 12))
+        self.slow_period = int(parameters.get("slow_period", 26))
+        self.signal_period = int(parameters.get("signal_period", 9))
         self.min_data_points = self.slow_period + self.signal_period + 10
+        self._compute = functools.partial(
+            _macd_last2, fast=self.fast_period, slow=self.slow_period, sig=self.signal_period
+        )
+        self.reset_state()
         
     def calculate_signal(self, data: pd.DataFrame) -> TradingSignal:
         if not self.validate_data(data):
-            return TradingSignal(SignalType.HOLD, 0.0, 0.0, pd.Timestamp.now(), self.name, self.parameters)
-        
-        # Calculate MACD
-        macd_indicator = ta.trend.MACD(
-            data['close'], 
-            window_fast=self.fast_period, 
-            window_slow=self.slow_period, 
-            window_sign=self.signal_period
-        )
+            return self._hold(0.0, _EPOCH)
         
-        macd_line = macd_indicator.macd()
-        signal_line = macd_indicator.macd_signal()
-        histogram = macd_indicator.macd_diff()
+        # Calculate current and previous MACD / signal line values
+        close = _ensure_close_array(data)
+        current_macd, prev_macd, current_signal, prev_signal = self._compute(close)
+        return self._macd_signal(current_macd, prev_macd, current_signal, prev_signal, close[-1], data.index[-1])
+    
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        current_price = bar[4]
+        i = self._bars_seen
         
-        current_price = data['close'].iloc[-1]
-        current_time = data.index[-1]
+        # EMAs seeded with the first close; MACD and signal line are NaN until
+        # their minimum periods, as in _macd_last2
+        if i == 0:
+            self._ema_fast = current_price
+            self._ema_slow = current_price
+        else:
+            self._ema_fast += 2.0 / (self.fast_period + 1) * (current_price - self._ema_fast)
+            self._ema_slow += 2.0 / (self.slow_period + 1) * (current_price - self._ema_slow)
         
-        # Get current and previous values
-        current_macd = macd_line.iloc[-1]
-        current_signal = signal_line.iloc[-1]
-        current_histogram = histogram.iloc[-1]
+        start = max(self.fast_period, self.slow_period) - 1
+        current_macd = np.nan
+        current_signal = np.nan
+        if i >= start:
+            current_macd = self._ema_fast - self._ema_slow
+            if i == start:
+                self._signal_ema = current_macd
+            else:
+                self._signal_ema += 2.0 / (self.signal_period + 1) * (current_macd - self._signal_ema)
+            if i - start + 1 >= self.signal_period:
+                current_signal = self._signal_ema
         
-        prev_macd = macd_line.iloc[-2]
-        prev_signal = signal_line.iloc[-2]
-        prev_histogram = histogram.iloc[-2]
+        prev_macd, prev_signal = self._prev_macd, self._prev_signal
+        self._prev_macd, self._prev_signal = current_macd, current_signal
+        self._bars_seen += 1
         
-        # Generate signals
+        current_time = _bar_time(bar)
+        if self._bars_seen < self.min_data_points:
+            return self._hold(current_price, current_time)
+        return self._macd_signal(current_macd, prev_macd, current_signal, prev_signal, current_price, current_time)
+    
+    def reset_state(self):
+        super().reset_state()
+        self._ema_fast = 0.0
+        self._ema_slow = 0.0
+        self._signal_ema = 0.0
+        self._prev_macd = np.nan
+        self._prev_signal = np.nan
+    
+    def _macd_signal(self, current_macd: float, prev_macd: float, current_signal: float, prev_signal: float,
+                     current_price: float, current_time: pd.Timestamp) -> TradingSignal:
+        """Signal for the current and previous MACD / signal line values"""
+        current_histogram = current_macd - current_signal
         if current_macd > current_signal and prev_macd <= prev_signal:
             # Golden cross - MACD crosses above signal line
-            confidence = min(1.0, abs(current_histogram) / abs(current_macd) if current_macd != 0 else 0.5)
+            confidence = min(1.0, abs(current_histogram) / (abs(current_macd) + 1e-12))
             return TradingSignal(
                 SignalType.BUY,
                 confidence,
@@ -203,7 +444,7 @@ class MACDStrategy(BaseStrategy):
             )
         elif current_macd < current_signal and prev_macd >= prev_signal:
             # Death cross - MACD crosses below signal line
-            confidence = min(1.0, abs(current_histogram) / abs(current_macd) if current_macd != 0 else 0.5)
+            confidence = min(1.0, abs(current_histogram) / (abs(current_macd) + 1e-12))
             return TradingSignal(
                 SignalType.SELL,
                 confidence,
@@ -219,43 +460,59 @@ class MACDStrategy(BaseStrategy):
                 }
             )
         else:
-            return TradingSignal(SignalType.HOLD, 0.0, current_price, current_time, self.name, self.parameters)
+            return self._hold(current_price, current_time)
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        return self._run_signal_kernel(
+            _macd_signals, data, self.fast_period, self.slow_period, self.signal_period
+        )
 
 class BollingerBandsStrategy(BaseStrategy):
     """Bollinger Bands Trading Strategy"""
     
+    __slots__ = ('period', 'std_dev', '_compute', '_window')
+    
     def __init__(self, parameters: Dict):
         super().__init__("Bollinger Bands Strategy", parameters)
-        self.period = parameters.get("period", 20)
-        self.std_dev = parameters.get("std_dev", 2.0)
+        self.period = int(parameters.get("period", 20))
+        self.std_dev = float(parameters.get("std_dev", 2.0))
         self.min_data_points = self.period + 10
+        self._compute = functools.partial(_bb_last, period=self.period, k=self.std_dev)
+        self.reset_state()
         
     def calculate_signal(self, data: pd.DataFrame) -> TradingSignal:
         if not self.validate_data(data):
-            return TradingSignal(SignalType.HOLD, 0.0, 0.0, pd.Timestamp.now(), self.name, self.parameters)
+            return self._hold(0.0, _EPOCH)
         
-        # Calculate Bollinger Bands
-        bb_indicator = ta.volatility.BollingerBands(
-            data['close'], 
-            window=self.period, 
-            window_dev=self.std_dev
-        )
-        
-        upper_band = bb_indicator.bollinger_hband()
-        middle_band = bb_indicator.bollinger_mavg()
-        lower_band = bb_indicator.bollinger_lband()
-        
-        current_price = data['close'].iloc[-1]
-        current_time = data.index[-1]
+        # Calculate Bollinger Bands for the last bar
+        close = _ensure_close_array(data)
+        upper_band, middle_band, lower_band = self._compute(close)
+        return self._band_signal(upper_band, middle_band, lower_band, close[-1], data.index[-1])
+    
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        current_price = bar[4]
+        self._window.append(current_price)
+        self._bars_seen += 1
         
-        # Calculate bandwidth and %B
-        bandwidth = (upper_band - lower_band) / middle_band
-        percent_b = (current_price - lower_band) / (upper_band - lower_band)
+        current_time = _bar_time(bar)
+        if self._bars_seen < self.min_data_points:
+            return self._hold(current_price, current_time)
         
-        # Generate signals
-        if current_price <= lower_band.iloc[-1]:
+        upper_band, middle_band, lower_band = self._compute(
+            np.fromiter(self._window, dtype=np.float64, count=self.period)
+        )
+        return self._band_signal(upper_band, middle_band, lower_band, current_price, current_time)
+    
+    def reset_state(self):
+        super().reset_state()
+        self._window = deque(maxlen=self.period)
+    
+    def _band_signal(self, upper_band: float, middle_band: float, lower_band: float,
+                     current_price: float, current_time: pd.Timestamp) -> TradingSignal:
+        """Signal for the price relative to the Bollinger Bands"""
+        if current_price <= lower_band:
             # Price touches or goes below lower band - potential buy signal
-            confidence = min(1.0, (lower_band.iloc[-1] - current_price) / current_price + 0.5)
+            confidence = min(1.0, (lower_band - current_price) / current_price + 0.5)
             return TradingSignal(
                 SignalType.BUY,
                 confidence,
@@ -263,17 +520,11 @@ class BollingerBandsStrategy(BaseStrategy):
                 current_time,
                 self.name,
                 self.parameters,
-                {
-                    "upper_band": upper_band.iloc[-1],
-                    "middle_band": middle_band.iloc[-1],
-                    "lower_band": lower_band.iloc[-1],
-                    "percent_b": percent_b.iloc[-1],
-                    "bandwidth": bandwidth.iloc[-1]
-                }
+                self._band_info(current_price, upper_band, middle_band, lower_band)
             )
-        elif current_price >= upper_band.iloc[-1]:
+        elif current_price >= upper_band:
             # Price touches or goes above upper band - potential sell signal
-            confidence = min(1.0, (current_price - upper_band.iloc[-1]) / current_price + 0.5)
+            confidence = min(1.0, (current_price - upper_band) / current_price + 0.5)
             return TradingSignal(
                 SignalType.SELL,
                 confidence,
@@ -281,42 +532,69 @@ class BollingerBandsStrategy(BaseStrategy):
                 current_time,
                 self.name,
                 self.parameters,
-                {
-                    "upper_band": upper_band.iloc[-1],
-                    "middle_band": middle_band.iloc[-1],
-                    "lower_band": lower_band.iloc[-1],
-                    "percent_b": percent_b.iloc[-1],
-                    "bandwidth": bandwidth.iloc[-1]
-                }
+                self._band_info(current_price, upper_band, middle_band, lower_band)
             )
         else:
-            return TradingSignal(SignalType.HOLD, 0.0, current_price, current_time, self.name, self.parameters)
+            return self._hold(current_price, current_time)
+    
+    @staticmethod
+    def _band_info(price: float, upper_band: float, middle_band: float, lower_band: float) -> Dict:
+        """Band values plus %B and bandwidth, only computed for actionable signals"""
+        width = upper_band - lower_band
+        return {
+            "upper_band": upper_band,
+            "middle_band": middle_band,
+            "lower_band": lower_band,
+            "percent_b": (price - lower_band) / width if width != 0 else np.nan,
+            "bandwidth": width / middle_band if middle_band != 0 else np.nan
+        }
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        return self._run_signal_kernel(_bb_signals, data, self.period, self.std_dev)
 
 class MovingAverageCrossoverStrategy(BaseStrategy):
     """Moving Average Crossover Trading Strategy"""
     
+    __slots__ = ('fast_period', 'slow_period', '_window')
+    
     def __init__(self, parameters: Dict):
         super().__init__("Moving Average Crossover Strategy", parameters)
-        self.fast_period = parameters.get("fast_period", 10)
-        self.slow_period = parameters.get("slow_period", 50)
+        self.fast_period = int(parameters.get("fast_period", 10))
+        self.slow_period = int(parameters.get("slow_period", 50))
         self.min_data_points = self.slow_period + 10
+        self.reset_state()
         
     def calculate_signal(self, data: pd.DataFrame) -> TradingSignal:
         if not self.validate_data(data):
-            return TradingSignal(SignalType.HOLD, 0.0, 0.0, pd.Timestamp.now(), self.name, self.parameters)
+            return self._hold(0.0, _EPOCH)
         
-        # Calculate moving averages
-        fast_ma = ta.trend.SMAIndicator(data['close'], window=self.fast_period).sma_indicator()
-        slow_ma = ta.trend.SMAIndicator(data['close'], window=self.slow_period).sma_indicator()
+        close = _ensure_close_array(data)
+        return self._crossover_signal(close, close[-1], data.index[-1])
+    
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        current_price = bar[4]
+        self._window.append(current_price)
+        self._bars_seen += 1
         
-        current_price = data['close'].iloc[-1]
-        current_time = data.index[-1]
+        current_time = _bar_time(bar)
+        if self._bars_seen < self.min_data_points:
+            return self._hold(current_price, current_time)
         
-        # Get current and previous values
-        current_fast_ma = fast_ma.iloc[-1]
-        current_slow_ma = slow_ma.iloc[-1]
-        prev_fast_ma = fast_ma.iloc[-2]
-        prev_slow_ma = slow_ma.iloc[-2]
+        close = np.fromiter(self._window, dtype=np.float64, count=len(self._window))
+        return self._crossover_signal(close, current_price, current_time)
+    
+    def reset_state(self):
+        super().reset_state()
+        # Enough closes for the previous bar's slow average
+        self._window = deque(maxlen=max(self.fast_period, self.slow_period) + 1)
+    
+    def _crossover_signal(self, close: np.ndarray, current_price: float, current_time: pd.Timestamp) -> TradingSignal:
+        """Signal from the moving averages over the tail of close"""
+        # Calculate current and previous moving averages from the tail of the closes
+        current_fast_ma = close[-self.fast_period:].mean(dtype=np.float64)
+        current_slow_ma = close[-self.slow_period:].mean(dtype=np.float64)
+        prev_fast_ma = close[-self.fast_period - 1:-1].mean(dtype=np.float64)
+        prev_slow_ma = close[-self.slow_period - 1:-1].mean(dtype=np.float64)
         
         # Generate signals
         if current_fast_ma > current_slow_ma and prev_fast_ma <= prev_slow_ma:
@@ -352,81 +630,120 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
                 }
             )
         else:
-            return TradingSignal(SignalType.HOLD, 0.0, current_price, current_time, self.name, self.parameters)
+            return self._hold(current_price, current_time)
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        return self._run_signal_kernel(
+            _ma_crossover_signals, data, self.fast_period, self.slow_period
+        )
 
 class GridTradingStrategy(BaseStrategy):
     """Grid Trading Strategy"""
     
+    __slots__ = ('grid_levels', 'grid_spacing', '_half_range', '_threshold', '_buy_ratio', '_sell_ratio')
+    
     def __init__(self, parameters: Dict):
         super().__init__("Grid Trading Strategy", parameters)
-        self.grid_levels = parameters.get("grid_levels", 10)
-        self.grid_spacing = parameters.get("grid_spacing", 0.02)  # 2% spacing
+        self.grid_levels = int(parameters.get("grid_levels", 10))
+        self.grid_spacing = float(parameters.get("grid_spacing", 0.02))  # 2% spacing
         self.min_data_points = 50
+        self._half_range = self.grid_spacing * self.grid_levels * 0.5
+        self._threshold = self.grid_spacing * 0.5
+        
+        # The grid is centred on the current price with spacing proportional to it,
+        # so the nearest levels and whether they are within reach are fixed ratios
+        # of the price. Ratios are None when there is no level to trade at.
+        below, above = self._nearest_grid_offsets()
+        self._buy_ratio = 1 - below if below is not None and below < self._threshold else None
+        self._sell_ratio = 1 + above if above is not None and above < self._threshold else None
+        self.reset_state()
+    
+    def _nearest_grid_offsets(self) -> Tuple[Optional[float], Optional[float]]:
+        """Distance from the price to the nearest grid level below and above, as a fraction of the price"""
+        levels = self.grid_levels
+        half_range = self._half_range
+        if levels < 1:
+            return None, None
+        if levels == 1:
+            # A single level sits at the bottom of the range
+            return half_range, None
+        
+        # Level k is (k - centre) steps away from the price; with an odd number of
+        # levels the centre level sits exactly at the price and counts as neither
+        step = 2 * half_range / (levels - 1)
+        centre = (levels - 1) / 2
+        below = (levels - 2) // 2
+        above = (levels - 1) // 2 + 1
+        return (centre - below) * step, (above - centre) * step
         
     def calculate_signal(self, data: pd.DataFrame) -> TradingSignal:
         if not self.validate_data(data):
-            return TradingSignal(SignalType.HOLD, 0.0, 0.0, pd.Timestamp.now(), self.name, self.parameters)
+            return self._hold(0.0, _EPOCH)
         
-        current_price = data['close'].iloc[-1]
-        current_time = data.index[-1]
+        return self._grid_signal(_ensure_close_array(data)[-1], data.index[-1])
+    
+    def update_signal(self, bar: Sequence[float]) -> TradingSignal:
+        current_price = bar[4]
+        self._bars_seen += 1
         
-        # Calculate grid levels
-        price_range = current_price * self.grid_spacing * self.grid_levels
-        grid_prices = np.linspace(
-            current_price - price_range/2,
-            current_price + price_range/2,
-            self.grid_levels
-        )
+        current_time = _bar_time(bar)
+        if self._bars_seen < self.min_data_points:
+            return self._hold(current_price, current_time)
+        return self._grid_signal(current_price, current_time)
+    
+    def _grid_signal(self, current_price: float, current_time: pd.Timestamp) -> TradingSignal:
+        """Signal for the price relative to the grid centred on it"""
+        # Trade at the nearest grid level when it is within half a spacing
+        if self._buy_ratio is not None:
+            confidence = 0.7
+            return TradingSignal(
+                SignalType.BUY,
+                confidence,
+                current_price,
+                current_time,
+                self.name,
+                self.parameters,
+                {
+                    "grid_level": current_price * self._buy_ratio,
+                    "grid_spacing": self.grid_spacing,
+                    "total_levels": self.grid_levels
+                }
+            )
         
-        # Find nearest grid levels
-        buy_levels = grid_prices[grid_prices < current_price]
-        sell_levels = grid_prices[grid_prices > current_price]
-        
-        if len(buy_levels) > 0:
-            nearest_buy = buy_levels[-1]
-            if current_price - nearest_buy < current_price * self.grid_spacing * 0.5:
-                confidence = 0.7
-                return TradingSignal(
-                    SignalType.BUY,
-                    confidence,
-                    current_price,
-                    current_time,
-                    self.name,
-                    self.parameters,
-                    {
-                        "grid_level": nearest_buy,
-                        "grid_spacing": self.grid_spacing,
-                        "total_levels": self.grid_levels
-                    }
-                )
-        
-        if len(sell_levels) > 0:
-            nearest_sell = sell_levels[0]
-            if nearest_sell - current_price < current_price * self.grid_spacing * 0.5:
-                confidence = 0.7
-                return TradingSignal(
-                    SignalType.SELL,
-                    confidence,
-                    current_price,
-                    current_time,
-                    self.name,
-                    self.parameters,
-                    {
-                        "grid_level": nearest_sell,
-                        "grid_spacing": self.grid_spacing,
-                        "total_levels": self.grid_levels
-                    }
-                )
-        
-        return TradingSignal(SignalType.HOLD, 0.0, current_price, current_time, self.name, self.parameters)
+        if self._sell_ratio is not None:
+            confidence = 0.7
+            return TradingSignal(
+                SignalType.SELL,
+                confidence,
+                current_price,
+                current_time,
+                self.name,
+                self.parameters,
+                {
+                    "grid_level": current_price * self._sell_ratio,
+                    "grid_spacing": self.grid_spacing,
+                    "total_levels": self.grid_levels
+                }
+            )
+        
+        return self._hold(current_price, current_time)
+    
+    def calculate_signals_batch(self, data: pd.DataFrame) -> SignalArray:
+        # The grid ratios do not depend on price, so every evaluated bar gets the same signal
+        signals = np.zeros(len(data), dtype=np.int8)
+        confidence = np.zeros(len(data), dtype=np.float32)
+        if self._buy_ratio is not None or self._sell_ratio is not None:
+            signals[self.min_data_points - 1:] = _BUY if self._buy_ratio is not None else _SELL
+            confidence[self.min_data_points - 1:] = 0.7
+        return _signal_array(data, signals, confidence)
 
 # Strategy factory
 class StrategyFactory:
     """Factory class for creating trading strategies"""
     
     @staticmethod
-    def create_strategy(strategy_type: str, parameters: Dict) -> BaseStrategy:
-        """Create a strategy instance based on type"""
+    def _strategy_class(strategy_type: str) -> type:
+        """Strategy class for a strategy type"""
         strategies = {
             "rsi": RSIStrategy,
             "macd": MACDStrategy,
@@ -438,7 +755,17 @@ class StrategyFactory:
         if strategy_type not in strategies:
             raise ValueError(f"Unknown strategy type: {strategy_type}")
         
-        return strategies[strategy_type](parameters)
+        return strategies[strategy_type]
+    
+    @staticmethod
+    def create_strategy(strategy_type: str, parameters: Dict) -> BaseStrategy:
+        """Create a strategy instance based on type"""
+        return StrategyFactory._strategy_class(strategy_type)(parameters)
+    
+    @staticmethod
+    def run_parameter_sweep(strategy_type: str, data: pd.DataFrame, parameter_sets: List[Dict]) -> List[SignalArray]:
+        """Batch-evaluate a strategy type over data once per parameter set"""
+        return StrategyFactory._strategy_class(strategy_type).calculate_signals_sweep(data, parameter_sets)
     
     @staticmethod
     def get_available_strategies() -> List[str]:
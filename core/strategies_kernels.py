@@ -0,0 +1,287 @@
+"""
+Numba kernels for strategy indicators.
+
+Each ``*_last`` kernel walks a close array once and returns only
+the values a strategy actually reads, instead of building full indicator
+Series. Results match the corresponding ``ta`` indicators.
+
+The ``*_signals`` kernels evaluate a strategy for every bar in one sweep,
+giving bar i the same result calculate_signal would give for close[:i + 1].
+They write signal codes and confidences into caller-allocated buffers.
+
+Kernels are compiled eagerly for explicit signatures and cached on disk,
+so neither process start nor the first signal pays JIT compilation after
+the first run. Callers must pass C-contiguous float64 or float32 arrays
+(writeable or read-only, as pandas copy-on-write returns) and integer
+periods. float32 closes halve the memory read per pass; the kernels still
+accumulate in float64.
+"""
+
+import numpy as np
+
+from core._njit import njit, prange
+
+# Reassociation/contraction only: the kernels return NaN for short inputs,
+# so the no-NaN/no-inf fast-math assumptions must stay off.
+_FASTMATH = {"reassoc", "contract", "arcp", "nsz"}
+_JIT_OPTIONS = dict(cache=True, fastmath=_FASTMATH, boundscheck=False)
+
+_CLOSE_TYPES = (
+    "f8[::1]", "Array(f8, 1, 'C', readonly=True)",
+    "f4[::1]", "Array(f4, 1, 'C', readonly=True)",
+)
+
+def _signatures(template: str) -> list:
+    """Expand a signature template over the accepted close array types"""
+    return [template.format(close=close_type) for close_type in _CLOSE_TYPES]
+
+# Signal codes written by the *_signals kernels
+_HOLD = 0
+_BUY = 1
+_SELL = -1
+
+@njit(_signatures("f8({close}, i8)"), **_JIT_OPTIONS)
+def _rsi_last(close, period):
+    """Last RSI value using Wilder's smoothing (matches ta.momentum.RSIIndicator)"""
+    n = close.shape[0]
+    if n < period:
+        return np.nan
+
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        change = close[i] - close[i - 1]
+        if change > 0:
+            avg_gain += alpha * (change - avg_gain)
+            avg_loss -= alpha * avg_loss
+        else:
+            avg_gain -= alpha * avg_gain
+            avg_loss += alpha * (-change - avg_loss)
+
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+@njit(_signatures("UniTuple(f8, 4)({close}, i8, i8, i8)"), **_JIT_OPTIONS)
+def _macd_last2(close, fast, slow, sig):
+    """Last two MACD and signal line values (matches ta.trend.MACD)
+
+    Returns (macd, prev_macd, signal, prev_signal). EMAs are seeded with the
+    first sample and values before their minimum periods are NaN, as in ta.
+    """
+    n = close.shape[0]
+    macd = np.nan
+    prev_macd = np.nan
+    signal = np.nan
+    prev_signal = np.nan
+    if n == 0:
+        return macd, prev_macd, signal, prev_signal
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_sig = 2.0 / (sig + 1)
+    start = max(fast, slow) - 1  # first index where both EMAs are defined
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    for i in range(n):
+        if i > 0:
+            ema_fast += alpha_fast * (close[i] - ema_fast)
+            ema_slow += alpha_slow * (close[i] - ema_slow)
+        if i >= start:
+            prev_macd = macd
+            prev_signal = signal
+            macd = ema_fast - ema_slow
+            if i == start:
+                signal = macd
+            else:
+                signal += alpha_sig * (macd - signal)
+
+    # The signal line needs `sig` MACD observations before it is defined
+    if n - start < sig:
+        signal = np.nan
+    if n - 1 - start < sig:
+        prev_signal = np.nan
+    return macd, prev_macd, signal, prev_signal
+
+@njit(**_JIT_OPTIONS)
+def _bb_window(close, end, period, k):
+    """Bollinger Bands (upper, middle, lower) over close[end - period:end]
+
+    Mean and population standard deviation are accumulated with Welford's
+    method.
+    """
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(end - period, end):
+        count += 1
+        delta = close[i] - mean
+        mean += delta / count
+        m2 += delta * (close[i] - mean)
+    std = np.sqrt(m2 / period)
+    return mean + k * std, mean, mean - k * std
+
+@njit(_signatures("UniTuple(f8, 3)({close}, i8, f8)"), **_JIT_OPTIONS)
+def _bb_last(close, period, k):
+    """Bollinger Bands for the last bar only (matches ta.volatility.BollingerBands)
+
+    Returns (upper, middle, lower).
+    """
+    n = close.shape[0]
+    if n < period:
+        return np.nan, np.nan, np.nan
+    return _bb_window(close, n, period, k)
+
+@njit(_signatures("void({close}, i8, f8, f8, i8, i1[::1], f4[::1])"), **_JIT_OPTIONS)
+def _rsi_signals(close, period, oversold, overbought, min_points, out_signal, out_conf):
+    """Per-bar RSI strategy signals"""
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(close.shape[0]):
+        if i > 0:
+            change = close[i] - close[i - 1]
+            if change > 0:
+                avg_gain += alpha * (change - avg_gain)
+                avg_loss -= alpha * avg_loss
+            else:
+                avg_gain -= alpha * avg_gain
+                avg_loss += alpha * (-change - avg_loss)
+
+        out_signal[i] = _HOLD
+        out_conf[i] = 0.0
+        if i + 1 < min_points or i + 1 < period:
+            continue
+
+        if avg_loss == 0.0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        if rsi < oversold:
+            out_signal[i] = _BUY
+            out_conf[i] = min(1.0, (oversold - rsi) / oversold)
+        elif rsi > overbought:
+            out_signal[i] = _SELL
+            out_conf[i] = min(1.0, (rsi - overbought) / (100 - overbought))
+
+@njit(["void(f8[::1], i8[::1], i8, f8, f8, i8, i1[::1], f4[::1])",
+       "void(f4[::1], i8[::1], i8, f8, f8, i8, i1[::1], f4[::1])"],
+      parallel=True, **_JIT_OPTIONS)
+def _rsi_signals_multi(closes, offsets, period, oversold, overbought, min_points, out_signal, out_conf):
+    """Per-bar RSI strategy signals for several symbols in parallel
+
+    Symbol s owns closes[offsets[s]:offsets[s + 1]] and the same range of the
+    output buffers.
+    """
+    for s in prange(offsets.shape[0] - 1):
+        start = offsets[s]
+        end = offsets[s + 1]
+        _rsi_signals(closes[start:end], period, oversold, overbought, min_points,
+                     out_signal[start:end], out_conf[start:end])
+
+@njit(_signatures("void({close}, i8[::1], f8[::1], f8[::1], i8[::1], i1[:, ::1], f4[:, ::1])"),
+      parallel=True, **_JIT_OPTIONS)
+def _rsi_signals_sweep(close, periods, oversold, overbought, min_points, out_signal, out_conf):
+    """Per-bar RSI strategy signals for several parameter sets in parallel
+
+    Parameter set p writes row p of the output buffers.
+    """
+    for p in prange(periods.shape[0]):
+        _rsi_signals(close, periods[p], oversold[p], overbought[p], min_points[p],
+                     out_signal[p], out_conf[p])
+
+@njit(_signatures("void({close}, i8, i8, i8, i8, i1[::1], f4[::1])"), **_JIT_OPTIONS)
+def _macd_signals(close, fast, slow, sig, min_points, out_signal, out_conf):
+    """Per-bar MACD crossover strategy signals"""
+    n = close.shape[0]
+    if n == 0:
+        return
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_sig = 2.0 / (sig + 1)
+    start = max(fast, slow) - 1
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    signal = 0.0
+    prev_macd = np.nan
+    prev_signal = np.nan
+    for i in range(n):
+        if i > 0:
+            ema_fast += alpha_fast * (close[i] - ema_fast)
+            ema_slow += alpha_slow * (close[i] - ema_slow)
+
+        # NaN until defined, exactly as _macd_last2 reports them
+        macd = np.nan
+        current_signal = np.nan
+        if i >= start:
+            macd = ema_fast - ema_slow
+            if i == start:
+                signal = macd
+            else:
+                signal += alpha_sig * (macd - signal)
+            if i - start + 1 >= sig:
+                current_signal = signal
+
+        out_signal[i] = _HOLD
+        out_conf[i] = 0.0
+        if i + 1 >= min_points:
+            confidence = min(1.0, abs(macd - current_signal) / (abs(macd) + 1e-12))
+            if macd > current_signal and prev_macd <= prev_signal:
+                out_signal[i] = _BUY
+                out_conf[i] = confidence
+            elif macd < current_signal and prev_macd >= prev_signal:
+                out_signal[i] = _SELL
+                out_conf[i] = confidence
+
+        prev_macd = macd
+        prev_signal = current_signal
+
+@njit(_signatures("void({close}, i8, f8, i8, i1[::1], f4[::1])"), **_JIT_OPTIONS)
+def _bb_signals(close, period, k, min_points, out_signal, out_conf):
+    """Per-bar Bollinger Bands strategy signals"""
+    for i in range(close.shape[0]):
+        out_signal[i] = _HOLD
+        out_conf[i] = 0.0
+        if i + 1 < min_points or i + 1 < period:
+            continue
+
+        upper, middle, lower = _bb_window(close, i + 1, period, k)
+        price = close[i]
+        if price <= lower:
+            out_signal[i] = _BUY
+            out_conf[i] = min(1.0, (lower - price) / price + 0.5)
+        elif price >= upper:
+            out_signal[i] = _SELL
+            out_conf[i] = min(1.0, (price - upper) / price + 0.5)
+
+@njit(**_JIT_OPTIONS)
+def _window_mean(close, end, period):
+    """Mean of close[end - period:end]"""
+    total = 0.0
+    for i in range(end - period, end):
+        total += close[i]
+    return total / period
+
+@njit(_signatures("void({close}, i8, i8, i8, i1[::1], f4[::1])"), **_JIT_OPTIONS)
+def _ma_crossover_signals(close, fast, slow, min_points, out_signal, out_conf):
+    """Per-bar moving average crossover strategy signals"""
+    for i in range(close.shape[0]):
+        out_signal[i] = _HOLD
+        out_conf[i] = 0.0
+        if i + 1 < min_points or i < fast or i < slow:
+            continue
+
+        fast_ma = _window_mean(close, i + 1, fast)
+        slow_ma = _window_mean(close, i + 1, slow)
+        prev_fast_ma = _window_mean(close, i, fast)
+        prev_slow_ma = _window_mean(close, i, slow)
+        if fast_ma > slow_ma and prev_fast_ma <= prev_slow_ma:
+            out_signal[i] = _BUY
+            out_conf[i] = min(1.0, (fast_ma - slow_ma) / slow_ma * 10)
+        elif fast_ma < slow_ma and prev_fast_ma >= prev_slow_ma:
+            out_signal[i] = _SELL
+            out_conf[i] = min(1.0, (slow_ma - fast_ma) / slow_ma * 10)
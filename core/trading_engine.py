@@ -1,19 +1,29 @@
 import asyncio
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from datetime import date, datetime, timedelta
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from enum import Enum
+from sqlalchemy import case, func
 
-from core.strategies import StrategyFactory, TradingSignal, SignalType
-from core.risk_management import RiskManager
+from core.strategies import BaseStrategy, StrategyFactory, TradingSignal, SignalType
+from core.risk_management import RiskManager, notional_to_quantity
 from core.exchange_interface import ExchangeInterface
 from core.database import SessionLocal, Trade, Portfolio, BotSession
 
 logger = logging.getLogger(__name__)
 
+# Bar length in seconds for the supported timeframes
+_TIMEFRAME_SECONDS = {
+    "1m": 60, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "4h": 14400, "1d": 86400, "1w": 604800
+}
+_MAX_MARKET_DATA_TTL = 300  # seconds
+
 class BotStatus(Enum):
     RUNNING = "running"
     STOPPED = "stopped"
@@ -30,6 +40,20 @@ class TradingDecision:
     risk_score: float
     timestamp: datetime
 
+@dataclass(slots=True)
+class ActiveStrategy:
+    """A strategy added to the engine and its trading state"""
+    strategy_id: int
+    strategy: BaseStrategy
+    type: str
+    parameters: Dict
+    symbol: str
+    # Signal as of last_bar_time, computed once per bar; readers such as the
+    # signals endpoint use it instead of re-evaluating the strategy
+    last_signal: Optional[TradingSignal] = None
+    last_bar_time: Optional[int] = None  # timestamp (ms) of the last bar fed to the strategy
+    active_positions: List[Dict] = field(default_factory=list)
+
 class TradingEngine:
     """Main trading engine that coordinates strategies and executes trades"""
     
@@ -37,11 +61,39 @@ class TradingEngine:
         self.user_id = user_id
         self.exchange_name = exchange_name
         self.status = BotStatus.STOPPED
-        self.active_strategies: Dict[int, Dict] = {}
+        self.active_strategies: Dict[int, ActiveStrategy] = {}
+        # Active strategies grouped by symbol, rebuilt only when strategies are added or removed
+        self._strategy_view: Dict[str, Tuple[ActiveStrategy, ...]] = {}
         self.risk_manager = RiskManager()
         self.exchange = ExchangeInterface(exchange_name)
         self.session_id = None
         
+        # Candle-close events: listeners queue (symbol, timeframe, closed bar or None)
+        # when a bar closes; None means the bars must be read from REST
+        self._candle_queue: asyncio.Queue = asyncio.Queue()
+        self._candle_listeners: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # Closed OHLCV bars per symbol, oldest first, as (timestamp ms, open, high, low, close, volume)
+        self._bar_buffers: Dict[str, Deque[Tuple]] = {}
+        
+        # Market data shared across strategies: key -> (expiry time, frame)
+        self._md_cache: Dict[Tuple[str, str, int], Tuple[float, pd.DataFrame]] = {}
+        self._md_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+        
+        # Balance fetched on the first actionable signal of a trading-loop iteration
+        # and shared by the iteration's other trades
+        self._tick_balance: Optional[float] = None
+        self._balance_lock = asyncio.Lock()
+        
+        # Trades waiting to be written to the database in batches
+        self._trade_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._trades_recorded = 0
+        self._trades_written = 0  # including batches whose write failed
+        
+        # Running P&L of today's trades, reconciled periodically from the database
+        self._daily_pnl = 0.0
+        self._daily_pnl_date = date.today()
+        
         # Performance tracking
         self.total_trades = 0
         self.total_pnl = 0.0
@@ -52,6 +104,13 @@ class TradingEngine:
         self.min_confidence = 0.6
         self.max_risk_per_trade = 0.02  # 2% per trade
         self.max_daily_loss = 0.05  # 5% daily loss limit
+        self.timeframe = "1h"
+        self.bar_buffer_size = 500  # closed bars kept per symbol
+        self.poll_interval = 30  # seconds, when WebSocket streaming is unavailable
+        self.risk_update_interval = 30  # seconds
+        self.db_batch_size = 100  # trades per database write
+        self.db_flush_interval = 0.05  # seconds to wait for more trades before writing
+        self.pnl_reconcile_interval = 60  # seconds
         
     async def start(self) -> bool:
         """Start the trading bot"""
@@ -70,9 +129,17 @@ class TradingEngine:
             # Create bot session
             self.session_id = await self._create_bot_session()
             
-            # Start trading loop
+            # Pick up trades already made today
+            await self._reconcile_daily_pnl()
+            
+            # Start candle listeners and the trading and risk loops
             self.status = BotStatus.RUNNING
+            for symbol in self._strategy_view:
+                self._ensure_candle_listener(symbol)
             asyncio.create_task(self._trading_loop())
+            asyncio.create_task(self._risk_loop())
+            asyncio.create_task(self._db_writer_loop())
+            asyncio.create_task(self._pnl_reconcile_loop())
             
             logger.info("Trading bot started successfully")
             return True
@@ -88,6 +155,14 @@ class TradingEngine:
             logger.info(f"Stopping trading bot for user {self.user_id}")
             self.status = BotStatus.STOPPED
             
+            # Stop candle listeners
+            for task in self._candle_listeners.values():
+                task.cancel()
+            self._candle_listeners.clear()
+            
+            # Persist trades still waiting in the write queue
+            await self._flush_trades()
+            
             # Close exchange connection
             await self.exchange.disconnect()
             
@@ -127,15 +202,13 @@ class TradingEngine:
     def add_strategy(self, strategy_id: int, strategy_type: str, parameters: Dict, symbol: str) -> bool:
         """Add a trading strategy to the bot"""
         try:
+            if not isinstance(strategy_id, int):
+                raise TypeError(f"strategy_id must be an int, got {type(strategy_id).__name__}")
             strategy = StrategyFactory.create_strategy(strategy_type, parameters)
-            self.active_strategies[strategy_id] = {
-                "strategy": strategy,
-                "type": strategy_type,
-                "parameters": parameters,
-                "symbol": symbol,
-                "last_signal": None,
-                "active_positions": []
-            }
+            self.active_strategies[strategy_id] = ActiveStrategy(strategy_id, strategy, strategy_type, parameters, symbol)
+            self._rebuild_strategy_view()
+            if self.status == BotStatus.RUNNING:
+                self._ensure_candle_listener(symbol)
             logger.info(f"Added strategy {strategy_type} for {symbol}")
             return True
         except Exception as e:
@@ -145,8 +218,19 @@ class TradingEngine:
     def remove_strategy(self, strategy_id: int) -> bool:
         """Remove a trading strategy from the bot"""
         try:
-            if str(strategy_id) in self.active_strategies:
-                del self.active_strategies[str(strategy_id)]
+            active = self.active_strategies.pop(strategy_id, None)
+            if active is not None:
+                active.strategy.cleanup()
+                self._rebuild_strategy_view()
+                
+                # Stop streaming the symbol once no strategy trades it
+                symbol = active.symbol
+                if symbol not in self._strategy_view:
+                    task = self._candle_listeners.pop((symbol, self.timeframe), None)
+                    if task is not None:
+                        task.cancel()
+                    self._bar_buffers.pop(symbol, None)
+                
                 logger.info(f"Removed strategy {strategy_id}")
                 return True
             return False
@@ -154,59 +238,227 @@ class TradingEngine:
             logger.error(f"Error removing strategy: {e}")
             return False
     
+    def _rebuild_strategy_view(self):
+        """Regroup the active strategies by symbol"""
+        view: Dict[str, List[ActiveStrategy]] = {}
+        for active in self.active_strategies.values():
+            view.setdefault(active.symbol, []).append(active)
+        self._strategy_view = {symbol: tuple(group) for symbol, group in view.items()}
+    
+    def _ensure_candle_listener(self, symbol: str):
+        """Start a candle listener for symbol unless one is already running"""
+        key = (symbol, self.timeframe)
+        task = self._candle_listeners.get(key)
+        if task is None or task.done():
+            self._candle_listeners[key] = asyncio.create_task(self._ws_candle_listener(symbol, self.timeframe))
+    
+    async def _ws_candle_listener(self, symbol: str, timeframe: str):
+        """Queue (symbol, timeframe, bar) whenever a candle closes on the exchange stream"""
+        last_open = None
+        
+        # Evaluate strategies once on startup rather than waiting for the first close
+        await self._candle_queue.put((symbol, timeframe, None))
+        
+        while self.status == BotStatus.RUNNING:
+            try:
+                candles = await self.exchange.watch_ohlcv(symbol, timeframe)
+                if not candles:
+                    # No stream available - fall back to polling
+                    await asyncio.sleep(self.poll_interval)
+                    await self._candle_queue.put((symbol, timeframe, None))
+                    continue
+                
+                # The newest candle is still forming; a new open time means the previous one closed
+                current_open = candles[-1][0]
+                if last_open is not None and current_open != last_open:
+                    closed = candles[-2] if len(candles) > 1 and candles[-2][0] == last_open else None
+                    await self._candle_queue.put((symbol, timeframe, closed))
+                last_open = current_open
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in candle listener for {symbol}: {e}")
+                await asyncio.sleep(self.poll_interval)
+    
     async def _trading_loop(self):
-        """Main trading loop that runs continuously"""
+        """Main trading loop, woken each time a candle closes for a traded symbol"""
         while self.status == BotStatus.RUNNING:
             try:
+                try:
+                    events = [await asyncio.wait_for(self._candle_queue.get(), timeout=60)]
+                except asyncio.TimeoutError:
+                    continue
+                
+                # Candles of all symbols close together; handle every event already queued
+                while not self._candle_queue.empty():
+                    events.append(self._candle_queue.get_nowait())
+                closed_bars: Dict[str, List[Optional[List]]] = {}
+                for symbol, _, closed_bar in events:
+                    closed_bars.setdefault(symbol, []).append(closed_bar)
+                
+                await asyncio.gather(
+                    *(self._update_symbol_bars(symbol, bars) for symbol, bars in closed_bars.items())
+                )
+                self._tick_balance = None
+                
                 # Check if we should pause trading
                 if await self._should_pause_trading():
                     logger.info("Trading paused due to risk limits")
                     await asyncio.sleep(60)  # Wait 1 minute
                     continue
                 
-                # Process each active strategy
-                for strategy_id, strategy_info in self.active_strategies.items():
-                    await self._process_strategy(strategy_id, strategy_info)
-                
-                # Update portfolio and risk metrics
-                await self._update_portfolio()
-                await self._update_risk_metrics()
-                
-                # Wait before next iteration
-                await asyncio.sleep(30)  # 30 second intervals
+                await self._process_symbols(list(closed_bars))
                 
             except Exception as e:
                 logger.error(f"Error in trading loop: {e}")
                 self.status = BotStatus.ERROR
                 await asyncio.sleep(60)
     
-    async def _process_strategy(self, strategy_id: int, strategy_info: Dict):
+    async def _risk_loop(self):
+        """Refresh portfolio and risk metrics on a fixed interval, independent of candle events"""
+        while self.status == BotStatus.RUNNING:
+            try:
+                symbols = await asyncio.to_thread(self._get_portfolio_symbols)
+                prices = await self._fetch_prices(symbols)
+                await asyncio.gather(self._update_portfolio(prices), self._update_risk_metrics())
+            except Exception as e:
+                logger.error(f"Error in risk loop: {e}")
+            await asyncio.sleep(self.risk_update_interval)
+    
+    async def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch the current prices of symbols, logging any the exchange did not return"""
+        try:
+            symbols = list(set(symbols))
+            prices = await self.exchange.get_current_prices(symbols)
+            missing = [symbol for symbol in symbols if symbol not in prices]
+            if missing:
+                logger.warning(f"No current price for {', '.join(missing)}")
+            return prices
+        except Exception as e:
+            logger.error(f"Error fetching prices: {e}")
+            return {}
+    
+    async def _get_tick_balance(self) -> float:
+        """Account balance, fetched once per trading-loop iteration when first needed"""
+        async with self._balance_lock:
+            if self._tick_balance is None:
+                self._tick_balance = await self.exchange.get_balance()
+            return self._tick_balance
+    
+    async def _update_bars(self, symbol: str, closed_bar: Optional[List]):
+        """Append a closed bar to the symbol's buffer, or fill the buffer from REST
+        
+        REST is used to seed the buffer, when no bar came with the event (polling)
+        and when bars were missed since the last one buffered.
+        """
+        try:
+            bars = self._bar_buffers.get(symbol)
+            bar_ms = _TIMEFRAME_SECONDS.get(self.timeframe, 3600) * 1000
+            if closed_bar is not None and bars:
+                if closed_bar[0] == bars[-1][0] + bar_ms:
+                    bars.append(tuple(closed_bar))
+                    return
+                if closed_bar[0] <= bars[-1][0]:
+                    return
+            
+            market_data = await self._get_market_data_cached(symbol, self.timeframe, 200)
+            if market_data is None or market_data.empty:
+                logger.warning(f"No market data for {symbol}")
+                return
+            
+            if bars is None:
+                bars = self._bar_buffers[symbol] = deque(maxlen=self.bar_buffer_size)
+            last_time = bars[-1][0] if bars else None
+            
+            # The last REST row is the candle still forming
+            times = market_data.index.as_unit('ms').asi8.tolist()
+            columns = [market_data[column].tolist() for column in ('open', 'high', 'low', 'close', 'volume')]
+            for bar in list(zip(times, *columns))[:-1]:
+                if last_time is None or bar[0] > last_time:
+                    bars.append(bar)
+            
+        except Exception as e:
+            logger.error(f"Error updating bars for {symbol}: {e}")
+    
+    async def _update_symbol_bars(self, symbol: str, closed_bars: List[Optional[List]]):
+        """Apply a symbol's candle events in the order they arrived"""
+        for closed_bar in closed_bars:
+            await self._update_bars(symbol, closed_bar)
+    
+    async def _process_symbols(self, symbols: List[str]):
+        """Feed the strategies trading symbols their new bars concurrently"""
+        # The view is replaced rather than mutated, so strategies added or
+        # removed meanwhile don't break the loop
+        view = self._strategy_view
+        await asyncio.gather(
+            *(self._process_strategy(active) for symbol in symbols for active in view.get(symbol, ())),
+            return_exceptions=True
+        )
+    
+    async def _handle_signal(self, active: ActiveStrategy, signal: TradingSignal, bar_time: int):
+        """Record a strategy's signal for its latest bar and act on it"""
+        active.last_bar_time = bar_time
+        active.last_signal = signal
+        
+        # Process signal if it's actionable
+        if signal.signal_type != SignalType.HOLD and signal.confidence >= self.min_confidence:
+            await self._execute_signal(signal, active)
+    
+    async def _process_strategy(self, active: ActiveStrategy):
         """Process a single trading strategy"""
         try:
-            symbol = strategy_info["symbol"]
-            strategy = strategy_info["strategy"]
+            symbol = active.symbol
+            strategy = active.strategy
             
-            # Get market data
-            market_data = await self.exchange.get_market_data(symbol, timeframe="1h", limit=200)
-            if market_data is None or len(market_data) < 100:
+            bars = self._bar_buffers.get(symbol)
+            if not bars:
                 logger.warning(f"Insufficient market data for {symbol}")
                 return
             
-            # Calculate trading signal
-            signal = strategy.calculate_signal(market_data)
-            strategy_info["last_signal"] = signal
+            # Feed the strategy the bars it has not seen yet, oldest first
+            last_bar_time = active.last_bar_time
+            new_bars = []
+            for bar in reversed(bars):
+                if last_bar_time is not None and bar[0] <= last_bar_time:
+                    break
+                new_bars.append(bar)
+            if not new_bars:
+                return
             
-            # Process signal if it's actionable
-            if signal.signal_type != SignalType.HOLD and signal.confidence >= self.min_confidence:
-                await self._execute_signal(signal, strategy_id, strategy_info)
+            for bar in reversed(new_bars):
+                signal = strategy.update_signal(bar)
+            await self._handle_signal(active, signal, new_bars[0][0])
             
         except Exception as e:
-            logger.error(f"Error processing strategy {strategy_id}: {e}")
+            logger.error(f"Error processing strategy {active.strategy_id}: {e}")
+    
+    async def _get_market_data_cached(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """Get market data, reusing a recent fetch until its TTL or the next bar close
+        
+        Concurrent callers for the same key wait on one lock, so strategies sharing
+        a symbol trigger a single REST request.
+        """
+        key = (symbol, timeframe, limit)
+        async with self._md_locks.setdefault(key, asyncio.Lock()):
+            now = time.time()
+            cached = self._md_cache.get(key)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+            
+            market_data = await self.exchange.get_market_data(symbol, timeframe=timeframe, limit=limit)
+            if market_data is not None:
+                bar_seconds = _TIMEFRAME_SECONDS.get(timeframe, 3600)
+                next_bar_close = (now // bar_seconds + 1) * bar_seconds
+                expires = min(now + min(_MAX_MARKET_DATA_TTL, bar_seconds / 2), next_bar_close)
+                self._md_cache[key] = (expires, market_data)
+            return market_data
     
-    async def _execute_signal(self, signal: TradingSignal, strategy_id: int, strategy_info: Dict):
+    async def _execute_signal(self, signal: TradingSignal, active: ActiveStrategy):
         """Execute a trading signal"""
         try:
-            symbol = strategy_info["symbol"]
+            symbol = active.symbol
+            strategy_id = active.strategy_id
             
             # Check risk limits
             if not await self.risk_manager.check_trade_allowed(self.user_id, signal, symbol):
@@ -214,7 +466,7 @@ class TradingEngine:
                 return
             
             # Calculate position size
-            position_size = await self._calculate_position_size(signal, strategy_info)
+            position_size = await self._calculate_position_size(signal, active)
             
             # Execute trade
             if signal.signal_type == SignalType.BUY:
@@ -223,12 +475,12 @@ class TradingEngine:
                 success = await self._execute_sell(symbol, position_size, signal.price, strategy_id)
             
             if success:
-                logger.info(f"Successfully executed {signal.signal_type.value} for {symbol}")
+                logger.info(f"Successfully executed {signal.signal_type.name} for {symbol}")
                 self.total_trades += 1
                 
                 # Update strategy info
                 if signal.signal_type == SignalType.BUY:
-                    strategy_info["active_positions"].append({
+                    active.active_positions.append({
                         "symbol": symbol,
                         "quantity": position_size,
                         "entry_price": signal.price,
@@ -292,14 +544,14 @@ class TradingEngine:
             logger.error(f"Error executing sell order: {e}")
             return False
     
-    async def _calculate_position_size(self, signal: TradingSignal, strategy_info: Dict) -> float:
-        """Calculate position size based on risk management rules"""
+    async def _calculate_position_size(self, signal: TradingSignal, active: ActiveStrategy) -> float:
+        """Calculate the order quantity, in the base asset, based on risk management rules"""
         try:
             # Get current portfolio value
-            portfolio_value = await self.exchange.get_balance()
+            portfolio_value = await self._get_tick_balance()
             
             # Calculate base position size
-            base_size = strategy_info["strategy"].get_position_size(
+            base_size = active.strategy.get_position_size(
                 portfolio_value, 
                 self.max_risk_per_trade
             )
@@ -310,11 +562,12 @@ class TradingEngine:
             # Apply risk manager adjustments
             final_size = await self.risk_manager.adjust_position_size(
                 self.user_id, 
-                signal.symbol, 
+                active.symbol, 
                 adjusted_size
             )
             
-            return final_size
+            # Sizes so far are in the quote currency; orders take a base-asset quantity
+            return notional_to_quantity(final_size, signal.price)
             
         except Exception as e:
             logger.error(f"Error calculating position size: {e}")
@@ -324,7 +577,7 @@ class TradingEngine:
         """Check if trading should be paused due to risk limits"""
         try:
             # Check daily loss limit
-            daily_pnl = await self._get_daily_pnl()
+            daily_pnl = self._current_daily_pnl()
             if daily_pnl < -(self.start_balance * self.max_daily_loss):
                 logger.warning("Daily loss limit reached")
                 return True
@@ -342,33 +595,97 @@ class TradingEngine:
             return True  # Pause on error for safety
     
     async def _record_trade(self, symbol: str, side: str, quantity: float, price: float, strategy_id: int):
-        """Record a trade in the database"""
+        """Queue a trade for the database writer"""
         try:
-            db = SessionLocal()
-            trade = Trade(
-                user_id=self.user_id,
-                strategy_id=strategy_id,
-                symbol=symbol,
-                side=side,
-                quantity=quantity,
-                price=price,
-                total_value=quantity * price,
-                fee=0.0,  # Calculate actual fee from exchange
-                exchange=self.exchange_name,
-                status="completed"
-            )
-            db.add(trade)
-            db.commit()
-            db.close()
+            await self._trade_queue.put({
+                "user_id": self.user_id,
+                "strategy_id": strategy_id,
+                "symbol": symbol,
+                "side": side,
+                "quantity": quantity,
+                "price": price,
+                "total_value": quantity * price,
+                "fee": 0.0,  # Calculate actual fee from exchange
+                "timestamp": datetime.utcnow(),
+                "exchange": self.exchange_name,
+                "status": "completed"
+            })
+            self._trades_recorded += 1
+            
+            # Sells bring cash in, buys pay it out
+            value = quantity * price
+            self._daily_pnl = self._current_daily_pnl() + (value if side == "SELL" else -value)
             
         except Exception as e:
             logger.error(f"Error recording trade: {e}")
     
+    async def _db_writer_loop(self):
+        """Write queued trades in batches of up to db_batch_size
+        
+        Keeps running while the bot is paused, so trades from orders still in
+        flight at pause time are written; stop() flushes what is left.
+        """
+        while self.status != BotStatus.STOPPED:
+            try:
+                try:
+                    batch = [await asyncio.wait_for(self._trade_queue.get(), timeout=1)]
+                except asyncio.TimeoutError:
+                    continue
+                
+                # Give trades from the same burst a moment to join the batch
+                deadline = time.monotonic() + self.db_flush_interval
+                while len(batch) < self.db_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._trade_queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await self._write_batch(batch)
+                
+            except Exception as e:
+                logger.error(f"Error writing trades: {e}")
+    
+    async def _flush_trades(self):
+        """Write every trade still in the queue"""
+        try:
+            batch = []
+            while not self._trade_queue.empty():
+                batch.append(self._trade_queue.get_nowait())
+            if batch:
+                await self._write_batch(batch)
+        except Exception as e:
+            logger.error(f"Error flushing trades: {e}")
+    
+    async def _write_batch(self, batch: List[Dict]):
+        """Write a batch of trades in a worker thread"""
+        try:
+            await asyncio.to_thread(self._write_trades, batch)
+        finally:
+            self._trades_written += len(batch)
+    
+    def _write_trades(self, batch: List[Dict]):
+        """Insert a batch of trades in one transaction"""
+        db = SessionLocal()
+        try:
+            db.bulk_save_objects([Trade(**trade) for trade in batch])
+            db.commit()
+        finally:
+            db.close()
+    
     async def _update_portfolio_position(self, symbol: str, quantity: float, price: float, side: str):
         """Update portfolio position after trade"""
         try:
-            db = SessionLocal()
-            
+            await asyncio.to_thread(self._update_portfolio_position_sync, symbol, quantity, price, side)
+        except Exception as e:
+            logger.error(f"Error updating portfolio: {e}")
+    
+    def _update_portfolio_position_sync(self, symbol: str, quantity: float, price: float, side: str):
+        """Apply a trade to the user's position for symbol"""
+        db = SessionLocal()
+        try:
             # Get existing position
             portfolio = db.query(Portfolio).filter(
                 Portfolio.user_id == self.user_id,
@@ -402,20 +719,33 @@ class TradingEngine:
                         db.delete(portfolio)
             
             db.commit()
+        finally:
             db.close()
+    
+    async def _update_portfolio(self, prices: Dict[str, float]):
+        """Update portfolio with current prices"""
+        try:
+            await asyncio.to_thread(self._apply_portfolio_prices, prices)
             
         except Exception as e:
             logger.error(f"Error updating portfolio: {e}")
     
-    async def _update_portfolio(self):
-        """Update portfolio with current prices"""
+    def _get_portfolio_symbols(self) -> List[str]:
+        """Symbols of the user's portfolio positions"""
+        db = SessionLocal()
+        try:
+            return [symbol for (symbol,) in db.query(Portfolio.symbol).filter(Portfolio.user_id == self.user_id)]
+        finally:
+            db.close()
+    
+    def _apply_portfolio_prices(self, prices: Dict[str, Optional[float]]):
+        """Revalue portfolio positions at the given prices in one transaction"""
+        db = SessionLocal()
         try:
-            db = SessionLocal()
             portfolios = db.query(Portfolio).filter(Portfolio.user_id == self.user_id).all()
             
             for portfolio in portfolios:
-                # Get current price from exchange
-                current_price = await self.exchange.get_current_price(portfolio.symbol)
+                current_price = prices.get(portfolio.symbol)
                 if current_price:
                     portfolio.current_price = current_price
                     portfolio.total_value = portfolio.quantity * current_price
@@ -423,10 +753,8 @@ class TradingEngine:
                     portfolio.pnl_percentage = (portfolio.pnl / (portfolio.quantity * portfolio.average_price)) * 100
             
             db.commit()
+        finally:
             db.close()
-            
-        except Exception as e:
-            logger.error(f"Error updating portfolio: {e}")
     
     async def _update_risk_metrics(self):
         """Update risk metrics"""
@@ -437,32 +765,68 @@ class TradingEngine:
         except Exception as e:
             logger.error(f"Error updating risk metrics: {e}")
     
+    def _current_daily_pnl(self) -> float:
+        """Running daily P&L, reset when the date changes"""
+        today = date.today()
+        if today != self._daily_pnl_date:
+            self._daily_pnl = 0.0
+            self._daily_pnl_date = today
+        return self._daily_pnl
+    
+    async def _pnl_reconcile_loop(self):
+        """Periodically reconcile the running daily P&L with the database"""
+        while self.status == BotStatus.RUNNING:
+            await asyncio.sleep(self.pnl_reconcile_interval)
+            await self._reconcile_daily_pnl()
+    
+    async def _reconcile_daily_pnl(self):
+        """Replace the running daily P&L with the database total"""
+        try:
+            # Trades still waiting for the writer are not in the database yet
+            recorded = self._trades_recorded
+            if recorded != self._trades_written:
+                return
+            
+            today = date.today()
+            daily_pnl = await self._get_daily_pnl()
+            if self._trades_recorded == recorded and date.today() == today:
+                self._daily_pnl = daily_pnl
+                self._daily_pnl_date = today
+        except Exception as e:
+            logger.error(f"Error reconciling daily P&L: {e}")
+    
     async def _get_daily_pnl(self) -> float:
-        """Get daily P&L"""
+        """Get daily P&L from the database"""
+        return await asyncio.to_thread(self._get_daily_pnl_sync)
+    
+    def _get_daily_pnl_sync(self) -> float:
+        """Sum today's trade cash flows"""
+        db = SessionLocal()
         try:
-            db = SessionLocal()
             today = datetime.now().date()
-            trades = db.query(Trade).filter(
+            daily_pnl = db.query(
+                func.coalesce(func.sum(case((Trade.side == "SELL", Trade.total_value), else_=-Trade.total_value)), 0.0)
+            ).filter(
                 Trade.user_id == self.user_id,
                 Trade.timestamp >= today
-            ).all()
-            
-            daily_pnl = sum([
-                (trade.total_value if trade.side == "SELL" else -trade.total_value)
-                for trade in trades
-            ])
+            ).scalar()
             
+            return float(daily_pnl)
+        finally:
             db.close()
-            return daily_pnl
-            
-        except Exception as e:
-            logger.error(f"Error calculating daily P&L: {e}")
-            return 0.0
     
     async def _create_bot_session(self) -> int:
         """Create a new bot session in the database"""
         try:
-            db = SessionLocal()
+            return await asyncio.to_thread(self._create_bot_session_sync)
+        except Exception as e:
+            logger.error(f"Error creating bot session: {e}")
+            return None
+    
+    def _create_bot_session_sync(self) -> int:
+        """Insert a bot session row and return its id"""
+        db = SessionLocal()
+        try:
             session = BotSession(
                 user_id=self.user_id,
                 strategy_id=1,  # Default strategy
@@ -472,29 +836,33 @@ class TradingEngine:
             db.add(session)
             db.commit()
             db.refresh(session)
-            db.close()
             return session.id
-        except Exception as e:
-            logger.error(f"Error creating bot session: {e}")
-            return None
+        finally:
+            db.close()
     
     async def _update_bot_session(self):
         """Update bot session status"""
         try:
             if self.session_id:
-                db = SessionLocal()
-                session = db.query(BotSession).filter(BotSession.id == self.session_id).first()
-                if session:
-                    session.status = self.status.value
-                    session.stopped_at = datetime.now() if self.status == BotStatus.STOPPED else None
-                    session.total_trades = self.total_trades
-                    session.total_pnl = self.total_pnl
-                    session.current_balance = self.current_balance
-                    db.commit()
-                db.close()
+                await asyncio.to_thread(self._update_bot_session_sync)
         except Exception as e:
             logger.error(f"Error updating bot session: {e}")
     
+    def _update_bot_session_sync(self):
+        """Write the current status and totals to the bot session row"""
+        db = SessionLocal()
+        try:
+            session = db.query(BotSession).filter(BotSession.id == self.session_id).first()
+            if session:
+                session.status = self.status.value
+                session.stopped_at = datetime.now() if self.status == BotStatus.STOPPED else None
+                session.total_trades = self.total_trades
+                session.total_pnl = self.total_pnl
+                session.current_balance = self.current_balance
+                db.commit()
+        finally:
+            db.close()
+    
     def get_status(self) -> Dict:
         """Get current bot status"""
         return {
@@ -1,9 +1,19 @@
+# Use uvloop for the event loop when available (not supported on Windows)
+try:
+    import uvloop
+    uvloop.install()
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import uvicorn
 import os
+import aiofiles
+from pathlib import Path
 from dotenv import load_dotenv
 
 from api.routes import auth, trading, portfolio, history
@@ -13,24 +23,67 @@ from core.config import settings
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+_FALLBACK_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Crypto Trading Bot</title>
+    <style>
+        body { font-family: Arial, sans-serif; text-align: center; padding: 50px; }
+        .container { max-width: 600px; margin: 0 auto; }
+        .btn { background: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🚀 Crypto Trading Bot</h1>
+        <p>Welcome to the Advanced Crypto Trading Bot!</p>
+        <a href="/api/docs" class="btn">View API Documentation</a>
+    </div>
+</body>
+</html>
+"""
+
+# The dashboard page is read once at startup and served from memory
+_INDEX_PATH = Path("static/index.html")
+try:
+    _INDEX_HTML = _INDEX_PATH.read_text()
+except FileNotFoundError:
+    _INDEX_HTML = _FALLBACK_HTML
+
+# In debug mode edits to the page are picked up: (mtime, contents) of the last read
+_index_cache = (None, _INDEX_HTML)
+
+async def _read_index_html() -> str:
+    """Current dashboard page, re-read without blocking only when the file changed"""
+    global _index_cache
+    try:
+        mtime = _INDEX_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return _FALLBACK_HTML
+    
+    if mtime != _index_cache[0]:
+        async with aiofiles.open(_INDEX_PATH, "r") as f:
+            _index_cache = (mtime, await f.read())
+    return _index_cache[1]
 
 app = FastAPI(
     title="🚀 Advanced Crypto Trading Bot",
     description="A sophisticated cryptocurrency trading bot with multiple strategies",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 # Mount static files
@@ -45,30 +98,9 @@ app.include_router(history.router, prefix="/api/history", tags=["History"])
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the main trading dashboard"""
-    try:
-        with open("static/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Crypto Trading Bot</title>
-            <style>
-                body { font-family: Arial, sans-serif; text-align: center; padding: 50px; }
-                .container { max-width: 600px; margin: 0 auto; }
-                .btn { background: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>🚀 Crypto Trading Bot</h1>
-                <p>Welcome to the Advanced Crypto Trading Bot!</p>
-                <a href="/api/docs" class="btn">View API Documentation</a>
-            </div>
-        </body>
-        </html>
-        """)
+    if settings.DEBUG:
+        return HTMLResponse(content=await _read_index_html())
+    return HTMLResponse(content=_INDEX_HTML)
 
 @app.get("/health")
 async def health_check():
@@ -76,10 +108,17 @@ async def health_check():
     return {"status": "healthy", "message": "Crypto Trading Bot is running"}
 
 if __name__ == "__main__":
+    # Create database tables once, before any server process starts
+    Base.metadata.create_all(bind=engine)
+    
+    # Auto-reload is a development aid; it watches files and allows only one worker
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.HOST,
+        port=settings.PORT,
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools",
         log_level="info"
     )
@@ -39,7 +39,7 @@ def create_admin_user():
             db.close()
             return True
         
-        # Create admin user
+        # Create admin user; hashing synchronously is fine outside the server
         admin_user = User(
             username="admin",
             email="admin@cryptobot.com",
@@ -135,7 +135,6 @@ def check_dependencies():
         import uvicorn
         import pandas
         import numpy
-        import ta
         import ccxt
         import sqlalchemy
         print("✅ All required dependencies are installed")
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+from core.risk_management import RiskContext, RiskManager, notional_to_quantity
+
+
+def test_notional_to_quantity_divides_by_price():
+    assert notional_to_quantity(120.0, 60000.0) == 0.002
+
+
+def test_notional_to_quantity_rounds_down_to_tick():
+    # 100 / 3 = 33.333...; rounding up would cost more than the notional
+    quantity = notional_to_quantity(100.0, 3.0)
+    assert quantity == 33.333333
+    assert quantity * 3.0 <= 100.0
+
+
+def test_notional_to_quantity_without_price():
+    assert notional_to_quantity(120.0, 0.0) == 0.0
+
+
+def _manager(monkeypatch, positions) -> RiskManager:
+    ctx = RiskContext(positions, sum(p.total_value for p in positions))
+    
+    async def get_user_portfolio(user_id):
+        return ctx
+    
+    manager = RiskManager()
+    monkeypatch.setattr(manager, "_get_user_portfolio", get_user_portfolio)
+    return manager
+
+
+def test_adjust_position_size_with_empty_portfolio(monkeypatch):
+    manager = _manager(monkeypatch, [])
+    
+    # LOW risk (score 0.18), scaled by the 0.75 factor for 30% volatility; no concentration cap
+    assert asyncio.run(manager.adjust_position_size(1, "BTC/USDT", 200.0)) == 150.0
+
+
+def test_adjust_position_size_below_concentration_cap(monkeypatch):
+    manager = _manager(monkeypatch, [SimpleNamespace(symbol="ETH/USDT", total_value=50000.0, pnl=0.0)])
+    
+    assert asyncio.run(manager.adjust_position_size(1, "BTC/USDT", 160.0)) == 120.0
+
+
+def test_adjust_position_size_capped_by_concentration(monkeypatch):
+    manager = _manager(monkeypatch, [SimpleNamespace(symbol="ETH/USDT", total_value=1000.0, pnl=0.0)])
+    
+    # Score 0.26; cap = 1000 * 10% * (1 - 0.26)
+    assert asyncio.run(manager.adjust_position_size(1, "BTC/USDT", 200.0)) == 74.0
+
+
+def test_assess_risk_batch_with_empty_portfolio(monkeypatch):
+    manager = _manager(monkeypatch, [])
+    
+    assessments = asyncio.run(manager.assess_risk_batch(1, ["BTC/USDT", "ETH/USDT"], [200.0, 50.0]))
+    
+    assert [a.max_position_size for a in assessments] == [200.0, 50.0]
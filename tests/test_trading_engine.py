@@ -0,0 +1,42 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("ccxt")
+pytest.importorskip("binance")
+
+from core.strategies import RSIStrategy, SignalType, TradingSignal
+from core.trading_engine import ActiveStrategy, TradingEngine
+
+
+class _Exchange:
+    async def get_balance(self):
+        return 10000.0
+
+
+class _RiskManager:
+    async def adjust_position_size(self, user_id, symbol, base_size):
+        return 120.0
+
+
+def _engine() -> TradingEngine:
+    # Skip __init__: it connects to the exchange
+    engine = TradingEngine.__new__(TradingEngine)
+    engine.user_id = 1
+    engine.exchange = _Exchange()
+    engine.risk_manager = _RiskManager()
+    engine.max_risk_per_trade = 0.02
+    engine._tick_balance = None
+    engine._balance_lock = asyncio.Lock()
+    return engine
+
+
+def test_position_size_is_a_base_asset_quantity():
+    active = ActiveStrategy(1, RSIStrategy({}), "rsi", {}, "BTC/USDT")
+    signal = TradingSignal(SignalType.BUY, 0.8, 60000.0, pd.Timestamp("2024-01-01"), "RSI Strategy", {})
+    
+    quantity = asyncio.run(_engine()._calculate_position_size(signal, active))
+    
+    # 120 USDT of BTC at 60000, not 120 BTC
+    assert quantity == 0.002